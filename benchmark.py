@@ -0,0 +1,266 @@
+import os
+import shutil
+import statistics
+import subprocess
+import threading
+import time
+
+import psutil
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import (
+    QDialog, QFormLayout, QSpinBox, QLineEdit, QPushButton, QHBoxLayout,
+    QComboBox, QDialogButtonBox, QFileDialog, QWidget
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class _HighWaterSampler(threading.Thread):
+    """Poll a process's VmHWM from /proc while the caller blocks in wait4."""
+
+    def __init__(self, pid, interval=0.002):
+        super().__init__(daemon=True)
+        self.path = f'/proc/{pid}/status'
+        self.interval = interval
+        self.peak = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                with open(self.path, 'rb') as f:
+                    for line in f:
+                        if line.startswith(b'VmHWM:'):
+                            self.peak = max(self.peak, int(line.split()[1]) * 1024)
+                            break
+            except (OSError, ValueError):
+                return
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _maxrss_bytes(usage):
+    # kilobytes on Linux, bytes on macOS
+    return usage.ru_maxrss if os.uname().sysname == 'Darwin' else usage.ru_maxrss * 1024
+
+
+def run_once(exe_path, stdin_path=None, timeout=60, cancelled=None):
+    """Run ``exe_path`` once; returns ``(wall_seconds, peak_rss_bytes, exit_code)``.
+
+    On POSIX the wall time ends when wait4 reaps the child. Elsewhere the
+    process is sampled with psutil until it exits. Returns None when
+    ``cancelled()`` became true and the process was killed.
+    """
+    stdin = open(stdin_path, 'rb') if stdin_path else subprocess.DEVNULL
+    try:
+        if resource is not None:
+            own_maxrss = _maxrss_bytes(resource.getrusage(resource.RUSAGE_SELF))
+        start = time.perf_counter()
+        proc = subprocess.Popen([exe_path], stdin=stdin, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, cwd=os.path.dirname(exe_path))
+        if resource is not None:
+            sampler = _HighWaterSampler(proc.pid)
+            sampler.start()
+            reaped = {}
+
+            # wait4 blocks in its own thread, so the wall time ends right at exit
+            # while this one keeps checking for Stop and the timeout
+            def reap():
+                reaped['status'] = os.wait4(proc.pid, 0)
+                reaped['wall'] = time.perf_counter() - start
+
+            reaper = threading.Thread(target=reap, daemon=True)
+            reaper.start()
+            deadline = start + timeout
+            stopped = False
+            while reaper.is_alive():
+                reaper.join(0.05)
+                if not reaper.is_alive():
+                    break
+                stopped = cancelled is not None and cancelled()
+                if stopped or time.perf_counter() > deadline:
+                    proc.kill()
+                    reaper.join()
+            _, status, usage = reaped['status']
+            wall = reaped['wall']
+            proc.returncode = os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status
+            sampler.stop()
+            if stopped:
+                return None
+            # ru_maxrss also counts this process's memory, which the child held
+            # between fork and exec, so it only means something above that
+            peak = sampler.peak
+            if _maxrss_bytes(usage) > own_maxrss:
+                peak = max(peak, _maxrss_bytes(usage))
+            return wall, peak, proc.returncode
+
+        peak = 0
+        deadline = start + timeout
+        watched = psutil.Process(proc.pid)
+        while proc.poll() is None:
+            try:
+                memory = watched.memory_info()
+                peak = max(peak, getattr(memory, 'peak_wset', memory.rss))
+            except psutil.Error:
+                pass
+            if cancelled is not None and cancelled():
+                proc.kill()
+                proc.wait()
+                return None
+            if time.perf_counter() > deadline:
+                proc.kill()
+                break
+            time.sleep(0.005)
+        proc.wait()
+        return time.perf_counter() - start, peak, proc.returncode
+    finally:
+        if stdin_path:
+            stdin.close()
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'min': ordered[0],
+        'median': statistics.median(ordered),
+        'p95': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'mean': statistics.fmean(ordered) if hasattr(statistics, 'fmean') else statistics.mean(ordered),
+        'stddev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+class BenchmarkRunner(QThread):
+    """Run one or two executables N times each and report timing statistics.
+
+    Builds are interleaved run by run, so drift in machine load affects all
+    of them alike. ``temp_dir``, if given, is removed once the runner is done.
+    """
+    output_signal = pyqtSignal(str)
+
+    def __init__(self, builds, runs=10, warmup=1, stdin_path=None, temp_dir=None):
+        super().__init__()
+        self.builds = builds  # [(label, exe_path)]
+        self.runs = runs
+        self.warmup = warmup
+        self.stdin_path = stdin_path or None
+        self.temp_dir = temp_dir
+
+    def run(self):
+        try:
+            self.benchmark()
+        finally:
+            if self.temp_dir:
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def benchmark(self):
+        labels = [label for label, _ in self.builds]
+        source = f" < {os.path.basename(self.stdin_path)}" if self.stdin_path else ""
+        self.output_signal.emit(
+            f"--- Benchmark: {' vs '.join(labels)}, {self.runs} runs + {self.warmup} warmup{source} ---\n")
+
+        walls = {label: [] for label in labels}
+        peaks = {label: [] for label in labels}
+        for iteration in range(self.warmup + self.runs):
+            for label, exe_path in self.builds:
+                if self.isInterruptionRequested():
+                    self.output_signal.emit("--- Benchmark cancelled ---\n")
+                    return
+                result = run_once(exe_path, self.stdin_path, cancelled=self.isInterruptionRequested)
+                if result is None:
+                    self.output_signal.emit("--- Benchmark cancelled ---\n")
+                    return
+                wall, peak, exit_code = result
+                if exit_code != 0:
+                    self.output_signal.emit(f"--- Benchmark stopped: {label} exited with code {exit_code} ---\n")
+                    return
+                if iteration >= self.warmup:
+                    walls[label].append(wall)
+                    peaks[label].append(peak)
+            if iteration >= self.warmup:
+                done = iteration - self.warmup + 1
+                self.output_signal.emit(f"run {done}/{self.runs}: " + "  ".join(
+                    f"{label} {walls[label][-1] * 1000:.2f} ms" for label in labels) + "\n")
+
+        self.output_signal.emit(self.report(labels, walls, peaks))
+
+    def report(self, labels, walls, peaks):
+        width = max(12, max(len(label) for label in labels) + 2)
+        lines = ["\n" + "".ljust(10) + "".join(label.rjust(width) for label in labels)]
+        summaries = {label: summarize(walls[label]) for label in labels}
+        for key in ('min', 'median', 'p95', 'mean', 'stddev'):
+            lines.append(key.ljust(10) + "".join(
+                f"{summaries[label][key] * 1000:.2f} ms".rjust(width) for label in labels))
+        lines.append("peak RSS".ljust(10) + "".join(
+            f"{max(peaks[label]) / (1024 * 1024):.1f} MB".rjust(width) for label in labels))
+        if len(labels) == 2:
+            first, second = (summaries[label]['median'] for label in labels)
+            if first > 0:
+                lines.append(f"\n{labels[1]} median is {second / first:.3f}x of {labels[0]}")
+        return "\n".join(lines) + "\n--- Benchmark finished ---\n\n"
+
+
+class BenchmarkDialog(QDialog):
+    """Options of a benchmark run: counts, stdin file and what to compare against."""
+
+    def __init__(self, profiles, current_profile, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Benchmark")
+        layout = QFormLayout(self)
+
+        self.runs = QSpinBox()
+        self.runs.setRange(1, 10000)
+        self.runs.setValue(20)
+        layout.addRow("Runs:", self.runs)
+
+        self.warmup = QSpinBox()
+        self.warmup.setRange(0, 1000)
+        self.warmup.setValue(2)
+        layout.addRow("Warmup runs:", self.warmup)
+
+        self.stdin_path = QLineEdit()
+        browse = QPushButton("...")
+        browse.setFixedWidth(30)
+        browse.clicked.connect(self.browse_stdin)
+        stdin_row = QWidget()
+        stdin_layout = QHBoxLayout(stdin_row)
+        stdin_layout.setContentsMargins(0, 0, 0, 0)
+        stdin_layout.addWidget(self.stdin_path)
+        stdin_layout.addWidget(browse)
+        layout.addRow("Stdin file:", stdin_row)
+
+        self.profile = QComboBox()
+        self.profile.addItems(profiles)
+        self.profile.setCurrentText(current_profile)
+        layout.addRow("Profile:", self.profile)
+
+        self.compare = QComboBox()
+        self.compare.addItem("Nothing", None)
+        for name in profiles:
+            self.compare.addItem(f"Profile: {name}", ('profile', name))
+        self.compare.addItem("Last committed revision (git HEAD)", ('head', None))
+        self.compare.addItem("Another source file...", ('file', None))
+        layout.addRow("Compare with:", self.compare)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def browse_stdin(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Stdin File", "", "Input Files (*.in *.txt);;All Files (*)")
+        if path:
+            self.stdin_path.setText(path)
+
+    def comparison(self):
+        """``None`` or ``(kind, value)``; ``kind`` is 'profile', 'head' or 'file'."""
+        choice = self.compare.currentData()
+        if choice and choice[0] == 'file':
+            path, _ = QFileDialog.getOpenFileName(self, "Compare With", "", "C/C++ Files (*.c *.cpp);;All Files (*)")
+            return ('file', path) if path else None
+        return choice
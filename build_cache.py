@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+from workspace_index import cache_dir
+
+
+_LOCAL_INCLUDE_RE = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*"([^"]+)"', re.M)
+
+# compiler path -> (mtime_ns, version line), so `--version` runs once per compiler
+_compiler_versions = {}
+
+
+def compiler_version(compiler):
+    path = shutil.which(compiler) or compiler
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    cached = _compiler_versions.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        result = subprocess.run([path, '--version'], capture_output=True, text=True, timeout=10)
+        version = result.stdout.splitlines()[0] if result.stdout else ''
+    except (OSError, subprocess.SubprocessError):
+        version = ''
+    _compiler_versions[path] = (mtime, version)
+    return version
+
+
+def source_digest(source_path):
+    """Hash a source file together with the local headers it includes, recursively."""
+    digest = hashlib.sha256()
+    seen = set()
+    pending = [os.path.abspath(source_path)]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        digest.update(path.encode('utf-8') + b'\0' + data + b'\0')
+        base = os.path.dirname(path)
+        for name in _LOCAL_INCLUDE_RE.findall(data):
+            header = os.path.normpath(os.path.join(base, name.decode('utf-8', 'replace')))
+            if os.path.isfile(header):
+                pending.append(header)
+    return digest.hexdigest()
+
+
+def build_key(source_path, compile_cmd, compiler):
+    """Cache key of a build: sources, command line and compiler version.
+
+    ``compile_cmd`` should not contain the source or output paths; the source
+    is covered by its content hash.
+    """
+    digest = hashlib.sha256()
+    digest.update(source_digest(source_path).encode('ascii'))
+    digest.update('\0'.join(compile_cmd).encode('utf-8'))
+    digest.update(compiler_version(compiler).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Binaries of previous successful builds, evicted least recently used first.
+
+    Safe to share between runner threads: a retired build can still be storing
+    its binary while the next one fetches.
+    """
+
+    def __init__(self, directory=None, max_entries=64, max_bytes=512 * 1024 * 1024):
+        self.directory = directory or cache_dir('builds')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        temp_path = self.manifest_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Could not save build cache: {e}")
+
+    def _binary_path(self, key):
+        return os.path.join(self.directory, key + '.bin')
+
+    def is_current(self, key, output_path):
+        """Whether ``output_path`` still holds the binary cached under ``key``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            try:
+                st = os.stat(output_path)
+            except OSError:
+                return False
+            return [st.st_mtime_ns, st.st_size] == entry['outputs'].get(output_path)
+
+    def fetch(self, key, output_path):
+        """Put the cached binary for ``key`` at ``output_path``.
+
+        Returns False on a miss. If ``output_path`` still holds the binary this
+        entry last placed there, it is reused as is.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            binary = self._binary_path(key)
+            if entry is None or not os.path.exists(binary):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return False
+
+            if not self.is_current(key, output_path):
+                try:
+                    shutil.copy2(binary, output_path)
+                except OSError:
+                    self.misses += 1
+                    return False
+                self._remember_output(entry, output_path)
+
+            entry['last_used'] = time.time()
+            self.hits += 1
+            self._save()
+            return True
+
+    def store(self, key, output_path):
+        binary = self._binary_path(key)
+        with self._lock:
+            try:
+                shutil.copy2(output_path, binary)
+            except OSError as e:
+                print(f"Could not cache build: {e}")
+                return
+            entry = {'size': os.path.getsize(binary), 'last_used': time.time(), 'outputs': {}}
+            self._remember_output(entry, output_path)
+            self._entries[key] = entry
+            self._evict()
+            self._save()
+
+    def _remember_output(self, entry, output_path):
+        st = os.stat(output_path)
+        entry['outputs'][output_path] = [st.st_mtime_ns, st.st_size]
+
+    def _evict(self):
+        total = sum(entry['size'] for entry in self._entries.values())
+        by_age = sorted(self._entries, key=lambda key: self._entries[key]['last_used'])
+        while by_age and (len(self._entries) > self.max_entries or total > self.max_bytes):
+            key = by_age.pop(0)
+            total -= self._entries.pop(key)['size']
+            try:
+                os.remove(self._binary_path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return f"{self.hits} hits, {self.misses} misses this session, {len(self._entries)} cached builds"
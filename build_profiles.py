@@ -0,0 +1,78 @@
+import json
+import os
+
+
+CONFIG_FILE = '.cpp_editor.json'
+DEFAULT_PROFILE = 'default'
+
+# Profile name -> extra compiler flags. Projects can add their own or
+# override these under "profiles" in the config file.
+BUILTIN_PROFILES = {
+    'default': [],
+    'debug': ['-g', '-O0'],
+    'release': ['-O2'],
+    'release-native': ['-O3', '-march=native'],
+    'sanitize': ['-g', '-O1', '-fno-omit-frame-pointer', '-fsanitize=address,undefined'],
+}
+
+
+class ProjectConfig:
+    """Build settings of a folder, kept in ``.cpp_editor.json`` at its root.
+
+    The folder has an active profile, and single files can override it::
+
+        {"active_profile": "release",
+         "file_profiles": {"bench/main.cpp": "release-native"},
+         "profiles": {"release-native": ["-O3", "-march=native", "-DNDEBUG"]}}
+    """
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+        self.path = os.path.join(self.folder, CONFIG_FILE)
+        self.data = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Could not read {self.path}: {e}")
+
+    def save(self):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+        except OSError as e:
+            print(f"Could not save {self.path}: {e}")
+
+    def profiles(self):
+        profiles = dict(BUILTIN_PROFILES)
+        profiles.update(self.data.get('profiles', {}))
+        return profiles
+
+    def flags(self, profile):
+        return list(self.profiles().get(profile, []))
+
+    def folder_profile(self):
+        return self.data.get('active_profile', DEFAULT_PROFILE)
+
+    def set_folder_profile(self, profile):
+        self.data['active_profile'] = profile
+        self.save()
+
+    def contains(self, file_path):
+        return os.path.abspath(file_path).startswith(os.path.join(self.folder, ''))
+
+    def file_profile(self, file_path):
+        """The profile of one file: its own override, else the folder's."""
+        relative = os.path.relpath(os.path.abspath(file_path), self.folder).replace(os.sep, '/')
+        return self.data.get('file_profiles', {}).get(relative, self.folder_profile())
+
+    def set_file_profile(self, file_path, profile):
+        relative = os.path.relpath(os.path.abspath(file_path), self.folder).replace(os.sep, '/')
+        file_profiles = self.data.setdefault('file_profiles', {})
+        if profile is None:
+            file_profiles.pop(relative, None)
+        else:
+            file_profiles[relative] = profile
+        self.save()
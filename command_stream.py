@@ -0,0 +1,100 @@
+import codecs
+import os
+import queue
+import subprocess
+import threading
+import time
+
+import psutil
+
+
+DEFAULT_COMPILE_TIMEOUT = 120
+
+
+def _pump(pipe, chunks):
+    try:
+        while True:
+            data = os.read(pipe.fileno(), 65536)
+            if not data:
+                break
+            chunks.put(data)
+    finally:
+        chunks.put(None)
+
+
+def _feed(pipe, data):
+    try:
+        pipe.write(data)
+        pipe.close()
+    except OSError:
+        pass  # the process exited or was killed before reading everything
+
+
+def _kill_tree(proc):
+    # The compiler driver runs cc1plus/as/ld as children, which would keep
+    # working (and keep the pipe open) if only the driver were killed
+    try:
+        children = psutil.Process(proc.pid).children(recursive=True)
+    except psutil.Error:
+        children = []
+    for process in children:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+    proc.kill()
+
+
+def stream_command(cmd, on_output, timeout=DEFAULT_COMPILE_TIMEOUT, cancelled=None, on_progress=None,
+                   cwd=None, progress_interval=1.0, input=None):
+    """Run ``cmd`` and hand its merged stdout/stderr to ``on_output`` as it arrives.
+
+    Returns the exit code, or None when ``cancelled()`` became true and the
+    process was killed. Raises ``subprocess.TimeoutExpired`` after
+    ``timeout`` seconds. ``on_progress`` gets the elapsed seconds about
+    every ``progress_interval``. ``input`` (bytes) is written to its stdin.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, cwd=cwd)
+    if input is not None:
+        threading.Thread(target=_feed, args=(proc.stdin, input), daemon=True).start()
+    chunks = queue.Queue()
+    reader = threading.Thread(target=_pump, args=(proc.stdout, chunks), daemon=True)
+    reader.start()
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    next_progress = start + progress_interval
+    finished = False
+    try:
+        while not finished:
+            try:
+                data = [chunks.get(timeout=0.1)]
+            except queue.Empty:
+                data = []
+            # Hand over everything already read as one piece
+            while not chunks.empty():
+                data.append(chunks.get_nowait())
+            if None in data:
+                finished = True
+                data.remove(None)
+            text = decoder.decode(b''.join(data), final=finished)
+            if text:
+                on_output(text)
+
+            now = time.perf_counter()
+            if cancelled is not None and cancelled():
+                _kill_tree(proc)
+                return None
+            if timeout is not None and now - start > timeout:
+                _kill_tree(proc)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if on_progress is not None and now >= next_progress:
+                on_progress(now - start)
+                next_progress = now + progress_interval
+        return proc.wait()
+    finally:
+        if proc.poll() is None:
+            _kill_tree(proc)
+        proc.wait()
+        reader.join(1)
+        proc.stdout.close()
@@ -0,0 +1,521 @@
+import bisect
+import re
+import sys
+from collections import OrderedDict
+
+
+_RAW_STRING_RE = re.compile(r'R"([^(]*)\(.*?\)\1"', re.DOTALL)
+
+_STRING_PATTERNS = (
+    (re.compile(r'"(?:[^"\\]|\\.)*"'), 'string'),  # Double quoted strings
+    (re.compile(r"'(?:[^'\\]|\\.)+'"), 'char'),    # Single quoted characters (including multi-char)
+    (re.compile(r"'(?:[^'\\]|\\.)'"), 'char'),     # Single quoted single characters
+)
+
+_ESCAPE_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\\[abfnrtv\\\'\"?]',  # Simple escapes
+    r'\\[0-7]{1,3}',        # Octal escapes
+    r'\\x[0-9a-fA-F]{1,2}', # Hex escapes
+    r'\\u[0-9a-fA-F]{4}',   # Unicode escapes
+    r'\\U[0-9a-fA-F]{8}',   # Extended Unicode escapes
+    r'\\N\{[^}]+\}',        # Named Unicode escapes
+))
+
+_LINE_COMMENT_RE = re.compile(r'//.*')
+_PREPROCESSOR_RE = re.compile(r'^\s*#\s*(\w+)(.*)$', re.MULTILINE)
+
+_NUMBER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Hexadecimal with suffixes
+    r'\b0[xX][0-9a-fA-F]+(?:[uUlL]|[uU][lL]|[lL][uU])*\b',
+    # Binary (C++14) with suffixes
+    r'\b0[bB][01]+(?:[uUlL]|[uU][lL]|[lL][uU])*\b',
+    # Octal with suffixes
+    r'\b0[0-7]+(?:[uUlL]|[uU][lL]|[lL][uU])*\b',
+    # Floating point with various formats
+    r'\b\d+\.\d*(?:[eE][+-]?\d+)?[fFlL]?\b',
+    r'\b\d*\.\d+(?:[eE][+-]?\d+)?[fFlL]?\b',
+    r'\b\d+[eE][+-]?\d+[fFlL]?\b',
+    # Decimal integers with suffixes
+    r'\b\d+(?:[uUlL]|[uU][lL]|[lL][uU])*\b',
+))
+# The only number pattern that can start on a '.' (e.g. ".5f")
+_DOT_NUMBER_RE = _NUMBER_PATTERNS[4]
+
+_OPERATOR_RE = re.compile(r'<<|>>|<=|>=|==|!=|&&|\|\||[+\-*/]=|\+\+|--|->|\*=|/=|%=|&=|\|=|\^=|<<=|>>=')
+_OPERATOR_CHARS = frozenset('+-*/%=<>!&|^~?')
+_PUNCTUATION_CHARS = frozenset(';,.')
+_BRACKET_FORMATS = {
+    '(': 'bracket_round', ')': 'bracket_round',
+    '{': 'bracket_curly', '}': 'bracket_curly',
+    '[': 'bracket_square', ']': 'bracket_square',
+}
+
+_CLASS_DECL_RE = re.compile(r'\b(?:class|struct|enum(?:\s+class)?)\s+([A-Z_][a-zA-Z0-9_]*)')
+_CLASS_USE_RE = re.compile(r'\b([A-Z][a-zA-Z0-9_]*)\s*(?:<|::)')
+_FUNCTION_RE = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_]*)\s*\(')
+_MEMBER_DOT_RE = re.compile(r'\.([a-zA-Z_][a-zA-Z0-9_]*)')
+_MEMBER_ARROW_RE = re.compile(r'->([a-zA-Z_][a-zA-Z0-9_]*)')
+_NAMESPACE_DECL_RE = re.compile(r'\bnamespace\s+([a-zA-Z_][a-zA-Z0-9_]*)')
+_NAMESPACE_USE_RE = re.compile(r'\b([a-zA-Z_][a-zA-Z0-9_]*)::')
+_LABEL_RE = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*):(?!=)', re.MULTILINE)
+_ATTRIBUTE_RE = re.compile(r'\[\[([^]]+)\]\]')
+
+_CLASS_INTRODUCERS = frozenset(('class', 'struct', 'enum'))
+_CALL_CONTEXT_SUFFIXES = ('return', 'if', 'while', 'for', '(', ',', '{', ';', '=', '!', '&&', '||')
+_CALL_CONTEXT_CHARS = '=!<>+-*/&|^%'
+
+# Every lexeme on a line is either a word starting with a digit, any other
+# word, or a single symbol character; whitespace is skipped.
+_LEXEME_RE = re.compile(r'(?P<number>\d\w*)|(?P<word>\w+)|(?P<symbol>[^\w\s])')
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class ExcludedRanges:
+    """Sorted index of the string, comment and directive ranges on a line.
+
+    A range is only added after checking that it does not overlap any earlier
+    one, so the ranges never intersect and sorting them by start also sorts
+    them by end. An overlap query then only needs to look at the last range
+    starting before the end of the query.
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+
+    def add(self, start, end):
+        i = bisect.bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+
+    def overlaps(self, start, end):
+        i = bisect.bisect_left(self._starts, end) - 1
+        return i >= 0 and self._ends[i] > start
+
+
+class TokenCache:
+    """LRU cache of tokenize() results keyed by line text and incoming state.
+
+    The size of every entry is estimated when it is stored and the least
+    recently used entries are dropped once the total exceeds ``max_bytes``.
+    ``hits`` and ``misses`` count lookups for profiling.
+    """
+
+    # Rough per-entry bookkeeping and per-span tuple cost, in bytes
+    ENTRY_OVERHEAD = 200
+    SPAN_SIZE = 120
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._entries = OrderedDict()
+
+    def get(self, text, previous_state):
+        key = (text, previous_state)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, text, previous_state, result):
+        key = (text, previous_state)
+        spans, state = result
+        entry_size = sys.getsizeof(text) + len(spans) * self.SPAN_SIZE + self.ENTRY_OVERHEAD
+        if entry_size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self._entries[key] = ((tuple(spans), state), entry_size)
+        self.size += entry_size
+
+        while self.size > self.max_bytes:
+            _, (_, dropped_size) = self._entries.popitem(last=False)
+            self.size -= dropped_size
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'bytes': self.size,
+        }
+
+
+class CppTokenizer:
+    def __init__(self):
+        # C keywords
+        self.c_keywords = [
+            'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
+            'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
+            'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
+            'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while'
+        ]
+
+        # C++ keywords
+        self.cpp_keywords = [
+            'alignas', 'alignof', 'and', 'and_eq', 'asm', 'bitand', 'bitor', 'bool',
+            'catch', 'class', 'compl', 'const_cast', 'constexpr', 'decltype', 'delete',
+            'dynamic_cast', 'explicit', 'export', 'false', 'friend', 'inline', 'mutable',
+            'namespace', 'new', 'noexcept', 'not', 'not_eq', 'nullptr', 'operator', 'or',
+            'or_eq', 'private', 'protected', 'public', 'reinterpret_cast', 'static_assert',
+            'static_cast', 'template', 'this', 'thread_local', 'throw', 'true', 'try',
+            'typeid', 'typename', 'using', 'virtual', 'wchar_t', 'xor', 'xor_eq', 'concept',
+            'requires', 'co_await', 'co_return', 'co_yield', 'consteval', 'constinit'
+        ]
+
+        # Control flow keywords (special highlighting)
+        self.control_keywords = [
+            'if', 'else', 'for', 'while', 'do', 'switch', 'case', 'default', 'break',
+            'continue', 'return', 'goto', 'try', 'catch', 'throw', 'co_return', 'co_yield'
+        ]
+
+        # Built-in functions
+        self.builtin_functions = [
+            'printf', 'scanf', 'sprintf', 'sscanf', 'fprintf', 'fscanf', 'fgets', 'fputs',
+            'malloc', 'calloc', 'realloc', 'free', 'strlen', 'strcpy', 'strncpy', 'strcmp',
+            'strncmp', 'strcat', 'strncat', 'strchr', 'strrchr', 'strstr', 'strtok',
+            'memcpy', 'memmove', 'memset', 'memcmp', 'memchr', 'fopen', 'fclose', 'fread',
+            'fwrite', 'fseek', 'ftell', 'rewind', 'fflush', 'getc', 'putc', 'getchar',
+            'putchar', 'puts', 'gets', 'atoi', 'atof', 'atol', 'strtol', 'strtod',
+            'rand', 'srand', 'exit', 'abort', 'atexit', 'system', 'getenv',
+            'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'atan2', 'sinh', 'cosh', 'tanh',
+            'exp', 'log', 'log10', 'pow', 'sqrt', 'ceil', 'floor', 'fabs', 'fmod',
+            'cout', 'cin', 'cerr', 'clog', 'endl', 'flush', 'getline', 'push_back',
+            'size', 'empty', 'clear', 'begin', 'end', 'find', 'insert', 'erase'
+        ]
+
+        # Built-in types
+        self.builtin_types = [
+            'size_t', 'ptrdiff_t', 'time_t', 'clock_t', 'FILE', 'wchar_t',
+            'string', 'vector', 'list', 'deque', 'set', 'multiset', 'map', 'multimap',
+            'unordered_set', 'unordered_multiset', 'unordered_map', 'unordered_multimap',
+            'stack', 'queue', 'priority_queue', 'pair', 'tuple', 'array', 'bitset',
+            'shared_ptr', 'unique_ptr', 'weak_ptr', 'auto_ptr', 'optional', 'variant',
+            'iostream', 'istream', 'ostream', 'ifstream', 'ofstream', 'stringstream',
+            'istringstream', 'ostringstream', 'iterator', 'const_iterator', 'reverse_iterator'
+        ]
+
+        # Primitive types
+        self.primitive_types = [
+            'bool', 'char', 'int', 'float', 'double', 'void', 'short', 'long',
+            'signed', 'unsigned', 'int8_t', 'int16_t', 'int32_t', 'int64_t',
+            'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t'
+        ]
+
+        # Constants
+        self.builtin_constants = [
+            'true', 'false', 'nullptr', 'NULL', 'EOF', 'SEEK_SET', 'SEEK_CUR', 'SEEK_END',
+            'EXIT_SUCCESS', 'EXIT_FAILURE', 'RAND_MAX', 'INT_MAX', 'INT_MIN',
+            'CHAR_MAX', 'CHAR_MIN', 'UCHAR_MAX', 'SHRT_MAX', 'SHRT_MIN', 'USHRT_MAX',
+            'LONG_MAX', 'LONG_MIN', 'ULONG_MAX', 'FLT_MAX', 'FLT_MIN', 'DBL_MAX', 'DBL_MIN'
+        ]
+
+        self.namespaces = ['std', 'boost', 'chrono', 'filesystem', 'ranges']
+
+        # A word that appears in several groups takes the format of the last one,
+        # matching the order the groups used to be painted in.
+        keyword_groups = [
+            (self.control_keywords, 'control_keyword'),
+            (self.c_keywords + self.cpp_keywords, 'keyword'),
+            (self.primitive_types, 'primitive_type'),
+            (self.builtin_types, 'builtin_type'),
+            (self.builtin_functions, 'builtin_function'),
+            (self.builtin_constants, 'constant')
+        ]
+        self.keyword_formats = {}
+        for keyword_list, fmt in keyword_groups:
+            for word in keyword_list:
+                self.keyword_formats[word] = fmt
+
+        self.non_function_names = frozenset(
+            self.c_keywords + self.cpp_keywords + self.control_keywords +
+            self.primitive_types + self.builtin_types)
+        self.namespace_names = frozenset(self.namespaces)
+
+        self._excluded_ranges = ExcludedRanges()
+
+    def tokenize(self, text, previous_state):
+        """Return ``(spans, state)`` for one line of text.
+
+        ``spans`` is a list of ``(start, length, format_name)`` tuples meant to
+        be applied in order, later spans overriding earlier ones. ``state`` is 1
+        when the line ends inside a block comment and 0 otherwise.
+        """
+        self._excluded_ranges = ExcludedRanges()
+        spans = []
+
+        state = self._tokenize_block_comments(text, previous_state, spans)
+        self._tokenize_strings_and_chars(text, spans)
+        self._tokenize_line_comments(text, spans)
+        self._tokenize_preprocessor(text, spans)
+        self._tokenize_code(text, spans)
+
+        return spans, state
+
+    def block_state(self, text, previous_state):
+        """Return only the block comment state at the end of the line."""
+        self._excluded_ranges = ExcludedRanges()
+        return self._tokenize_block_comments(text, previous_state, [])
+
+    def _is_excluded(self, start, end=None):
+        if end is None:
+            end = start + 1
+        return self._excluded_ranges.overlaps(start, end)
+
+    def _tokenize_block_comments(self, text, previous_state, spans):
+        if previous_state == 1:
+            end = text.find('*/')
+            if end == -1:
+                spans.append((0, len(text), 'comment_block'))
+                self._excluded_ranges.add(0, len(text))
+                return 1
+            spans.append((0, end + 2, 'comment_block'))
+            self._excluded_ranges.add(0, end + 2)
+
+        start = text.find('/*')
+        while start >= 0:
+            if not self._is_excluded(start):
+                is_doc_comment = start + 2 < len(text) and text[start + 2] in ['*', '!']
+                fmt = 'comment_doc' if is_doc_comment else 'comment_block'
+
+                end = text.find('*/', start + 2)
+                if end == -1:
+                    spans.append((start, len(text) - start, fmt))
+                    self._excluded_ranges.add(start, len(text))
+                    return 1
+                spans.append((start, end - start + 2, fmt))
+                self._excluded_ranges.add(start, end + 2)
+                start = text.find('/*', end + 2)
+            else:
+                start = text.find('/*', start + 1)
+        return 0
+
+    def _tokenize_strings_and_chars(self, text, spans):
+        if '"' not in text and "'" not in text:
+            return
+
+        for match in _RAW_STRING_RE.finditer(text):
+            if not self._is_excluded(match.start(), match.end()):
+                spans.append((match.start(), match.end() - match.start(), 'raw_string'))
+                self._excluded_ranges.add(match.start(), match.end())
+
+        for pattern, fmt in _STRING_PATTERNS:
+            for match in pattern.finditer(text):
+                if not self._is_excluded(match.start(), match.end()):
+                    spans.append((match.start(), match.end() - match.start(), fmt))
+                    self._excluded_ranges.add(match.start(), match.end())
+                    self._tokenize_escape_sequences(text, match.start(), match.end(), spans)
+
+    def _tokenize_escape_sequences(self, text, start, end, spans):
+        substring = text[start:end]
+        if '\\' not in substring:
+            return
+        for pattern in _ESCAPE_PATTERNS:
+            for match in pattern.finditer(substring):
+                spans.append((start + match.start(), match.end() - match.start(), 'escape_sequence'))
+
+    def _tokenize_line_comments(self, text, spans):
+        # '//.*' runs to the end of the line, so only the first '//' can match
+        match = _LINE_COMMENT_RE.search(text)
+        if match and not self._is_excluded(match.start(), match.end()):
+            comment_text = match.group()
+            is_doc_comment = comment_text.startswith('///') or comment_text.startswith('//!')
+            fmt = 'comment_doc' if is_doc_comment else 'comment'
+
+            spans.append((match.start(), match.end() - match.start(), fmt))
+            self._excluded_ranges.add(match.start(), match.end())
+
+    def _tokenize_preprocessor(self, text, spans):
+        if '#' not in text:
+            return
+        for match in _PREPROCESSOR_RE.finditer(text):
+            if not self._is_excluded(match.start(), match.end()):
+                directive_end = match.start(1) + len(match.group(1))
+                spans.append((match.start(), directive_end - match.start(), 'preprocessor_keyword'))
+
+                if match.group(2):
+                    spans.append((directive_end, len(match.group(2)), 'preprocessor'))
+
+                self._excluded_ranges.add(match.start(), match.end())
+
+    def _tokenize_code(self, text, spans):
+        """Scan the line once and classify every lexeme outside strings and comments.
+
+        Each context pattern is only tried where it could start and remembers
+        where its last match ended, so the result is the same as running every
+        pattern over the whole line with ``finditer``. Spans are collected per
+        category and emitted in the order the categories override each other.
+        """
+        is_excluded = self._is_excluded
+        keyword_formats = self.keyword_formats
+        resume = {}
+
+        def match_at(pattern, pos):
+            if pos < resume.get(pattern, 0):
+                return None
+            match = pattern.match(text, pos)
+            if match:
+                resume[pattern] = match.end()
+            return match
+
+        def add_group(bucket, match, fmt):
+            start, end = match.span(1)
+            if not is_excluded(start, end):
+                bucket.append((start, end - start, fmt))
+
+        numbers = []
+        keywords = []
+        operators = []
+        punctuation = []
+        brackets = []
+        class_names = []
+        function_names = []
+        members = []
+        namespaces = []
+        labels = []
+        attributes = []
+
+        for lexeme in _LEXEME_RE.finditer(text):
+            kind = lexeme.lastgroup
+            pos = lexeme.start()
+
+            if kind == 'number':
+                for pattern in _NUMBER_PATTERNS:
+                    match = match_at(pattern, pos)
+                    if match and not is_excluded(match.start(), match.end()):
+                        numbers.append((match.start(), match.end() - match.start(), 'number'))
+
+            elif kind == 'word':
+                word = lexeme.group()
+                end = lexeme.end()
+
+                fmt = keyword_formats.get(word)
+                if fmt and not is_excluded(pos, end):
+                    keywords.append((pos, end - pos, fmt))
+
+                if word in _CLASS_INTRODUCERS:
+                    match = match_at(_CLASS_DECL_RE, pos)
+                    if match:
+                        add_group(class_names, match, 'class_name')
+                elif word == 'namespace':
+                    match = match_at(_NAMESPACE_DECL_RE, pos)
+                    if match:
+                        add_group(namespaces, match, 'namespace')
+
+                match = match_at(_CLASS_USE_RE, pos)
+                if match:
+                    add_group(class_names, match, 'class_name')
+
+                match = match_at(_FUNCTION_RE, pos)
+                if match and word not in self.non_function_names:
+                    start, end = match.span(1)
+                    if not is_excluded(start, end):
+                        function_names.append(
+                            (start, end - start, self._function_format(text, start)))
+
+                match = match_at(_NAMESPACE_USE_RE, pos)
+                if match and match.group(1) in self.namespace_names:
+                    add_group(namespaces, match, 'namespace')
+
+            else:
+                ch = lexeme.group()
+                excluded = is_excluded(pos, pos + 1)
+
+                if ch in _OPERATOR_CHARS:
+                    match = match_at(_OPERATOR_RE, pos)
+                    if match and not is_excluded(match.start(), match.end()):
+                        operators.append((match.start(), match.end() - match.start(), 'operator'))
+                    if not excluded:
+                        operators.append((pos, 1, 'operator'))
+                    if ch == '-':
+                        match = match_at(_MEMBER_ARROW_RE, pos)
+                        if match:
+                            add_group(members, match, 'member_access')
+                    elif ch in '<>' and not excluded and self._is_angle_bracket(text, pos):
+                        brackets.append((pos, 1, 'bracket_angle'))
+
+                elif ch in _PUNCTUATION_CHARS:
+                    if not excluded:
+                        punctuation.append((pos, 1, 'punctuation'))
+                    if ch == '.':
+                        match = match_at(_DOT_NUMBER_RE, pos)
+                        if match and not is_excluded(match.start(), match.end()):
+                            numbers.append((match.start(), match.end() - match.start(), 'number'))
+                        match = match_at(_MEMBER_DOT_RE, pos)
+                        if match:
+                            add_group(members, match, 'member_access')
+
+                elif ch in _BRACKET_FORMATS:
+                    if not excluded:
+                        brackets.append((pos, 1, _BRACKET_FORMATS[ch]))
+                    if ch == '[':
+                        match = match_at(_ATTRIBUTE_RE, pos)
+                        if match and not is_excluded(match.start(), match.end()):
+                            attributes.append((match.start(), match.end() - match.start(), 'attribute'))
+
+        # The second of the original operator patterns was '::|.*...'. Its '.*'
+        # branch always wins over the word operators listed after it, so it
+        # paints from the first column after any leading '::' pairs to the end
+        # of the line, unless that range touches a string, comment or directive.
+        pos = 0
+        while text.startswith('::', pos):
+            if not is_excluded(pos, pos + 2):
+                operators.append((pos, 2, 'operator'))
+            pos += 2
+        if pos < len(text) and not is_excluded(pos, len(text)):
+            operators.append((pos, len(text) - pos, 'operator'))
+
+        match = _LABEL_RE.match(text)
+        if match:
+            add_group(labels, match, 'label')
+
+        for bucket in (numbers, keywords, operators, punctuation, brackets, class_names,
+                       function_names, members, namespaces, labels, attributes):
+            spans.extend(bucket)
+
+    def _function_format(self, text, start):
+        end = start
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        if (
+            end == 0 or
+            text.endswith(_CALL_CONTEXT_SUFFIXES, 0, end) or
+            text[end - 1] in _CALL_CONTEXT_CHARS
+        ):
+            return 'function_call'
+        return 'function_name'
+
+    def _is_angle_bracket(self, text, pos):
+        end = pos
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+        after = pos + 1
+        while after < len(text) and text[after].isspace():
+            after += 1
+
+        # 'template' immediately before, ignoring whitespace
+        if (end >= 8 and text.startswith('template', end - 8) and
+                (end == 8 or not _is_word_char(text[end - 9]))):
+            return True
+        # a word on both sides, ignoring whitespace
+        if (end > 0 and _is_word_char(text[end - 1]) and
+                after < len(text) and _is_word_char(text[after])):
+            return True
+        # followed by ',' or '>'
+        return after < len(text) and text[after] in ',>'
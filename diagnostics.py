@@ -0,0 +1,139 @@
+import os
+import re
+from collections import namedtuple
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView
+
+
+Diagnostic = namedtuple('Diagnostic', 'file line column severity message')
+
+# file:line:column: severity: message, as printed by gcc and clang
+_DIAGNOSTIC_RE = re.compile(r'^(.+?):(\d+):(?:(\d+):)? (fatal error|error|warning|note): (.*)$')
+
+SEVERITY_COLORS = {
+    'error': QColor('#d32f2f'),
+    'fatal error': QColor('#d32f2f'),
+    'warning': QColor('#f9a825'),
+    'note': QColor('#1976d2'),
+}
+
+
+class DiagnosticParser:
+    """Turns compiler output into ``Diagnostic`` records as it arrives.
+
+    Text can be fed in arbitrary pieces; a line is parsed once it is
+    complete. Source excerpts, carets and "In file included from" lines are
+    skipped. Relative file names are resolved against ``directory``, and
+    ``<stdin>`` becomes ``stdin_path`` when the source was piped in.
+    """
+
+    def __init__(self, directory=None, stdin_path=None):
+        self.directory = directory
+        self.stdin_path = stdin_path
+        self._partial = ''
+
+    def feed(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        return [d for d in map(self._parse_line, lines) if d is not None]
+
+    def finish(self):
+        line, self._partial = self._partial, ''
+        diagnostic = self._parse_line(line)
+        return [diagnostic] if diagnostic else []
+
+    def _parse_line(self, line):
+        match = _DIAGNOSTIC_RE.match(line.rstrip('\r'))
+        if match is None:
+            return None
+        path, line_number, column, severity, message = match.groups()
+        if path == '<stdin>' and self.stdin_path:
+            path = self.stdin_path
+        elif self.directory and not os.path.isabs(path):
+            path = os.path.join(self.directory, path)
+        return Diagnostic(os.path.normpath(path), int(line_number), int(column or 1), severity, message)
+
+
+def parse_diagnostics(text, directory=None):
+    parser = DiagnosticParser(directory)
+    return parser.feed(text) + parser.finish()
+
+
+def same_file(first, second):
+    return os.path.normcase(os.path.abspath(first)) == os.path.normcase(os.path.abspath(second))
+
+
+class DiagnosticsModel(QAbstractListModel):
+    """Diagnostics for a QListView; rows are only formatted when they are shown."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.diagnostics = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.diagnostics)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        diagnostic = self.diagnostics[index.row()]
+        if role == Qt.DisplayRole:
+            return (f"{diagnostic.severity:<8} {os.path.basename(diagnostic.file)}:{diagnostic.line}:"
+                    f"{diagnostic.column}  {diagnostic.message[:300]}")
+        if role == Qt.ToolTipRole:
+            return f"{diagnostic.file}:{diagnostic.line}:{diagnostic.column}\n{diagnostic.message}"
+        if role == Qt.ForegroundRole:
+            return SEVERITY_COLORS.get(diagnostic.severity)
+        if role == Qt.UserRole:
+            return diagnostic
+        return None
+
+    def set_diagnostics(self, diagnostics):
+        self.beginResetModel()
+        self.diagnostics = list(diagnostics)
+        self.endResetModel()
+
+
+class ProblemsPanel(QWidget):
+    """List of compiler diagnostics; activating one jumps to its location."""
+    location_activated = pyqtSignal(str, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self.summary = QLabel()
+        self.summary.setStyleSheet("padding: 3px; background-color: #f0f0f0;")
+        layout.addWidget(self.summary)
+
+        self.model = DiagnosticsModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        # Fixed row height lets the view lay out thousands of rows without measuring them
+        self.view.setUniformItemSizes(True)
+        self.view.setStyleSheet("QListView { font-family: 'Consolas', 'Courier New', monospace; }")
+        self.view.activated.connect(self.on_activated)
+        self.view.clicked.connect(self.on_activated)
+        layout.addWidget(self.view)
+        self.update_summary()
+
+    def set_diagnostics(self, diagnostics):
+        self.model.set_diagnostics(diagnostics)
+        self.update_summary()
+
+    def update_summary(self):
+        counts = {}
+        for diagnostic in self.model.diagnostics:
+            severity = 'error' if diagnostic.severity == 'fatal error' else diagnostic.severity
+            counts[severity] = counts.get(severity, 0) + 1
+        self.summary.setText(f"Problems: {counts.get('error', 0)} errors, {counts.get('warning', 0)} warnings, "
+                             f"{counts.get('note', 0)} notes")
+
+    def on_activated(self, index):
+        diagnostic = index.data(Qt.UserRole)
+        if diagnostic is not None:
+            self.location_activated.emit(diagnostic.file, diagnostic.line, diagnostic.column)
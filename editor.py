@@ -1,12 +1,303 @@
-from PyQt5.QtWidgets import QPlainTextEdit, QTextEdit, QCompleter, QWidget,QAction
-from PyQt5.QtGui import QTextCursor, QFont, QPainter, QColor, QTextFormat,QKeySequence
-from PyQt5.QtCore import Qt, QStringListModel, QRect, QSize
+from PyQt5.QtWidgets import QPlainTextEdit, QTextEdit, QCompleter, QWidget,QAction, QToolTip
+from PyQt5.QtGui import QTextCursor, QFont, QPainter, QColor, QTextFormat,QKeySequence, QTextCharFormat
+from PyQt5.QtCore import (
+    Qt, QStringListModel, QRect, QSize, QPoint, QObject, QThread, QTimer, QEvent,
+    QCoreApplication, pyqtSignal, pyqtSlot
+)
+import bisect
+import heapq
+import itertools
 import re
+import sys
+import time
+from collections import Counter, OrderedDict, deque
 
 
 from cpp_highlighter import CppHighlighter  
 
 
+# C/C++ keywords and common functions
+COMPLETION_KEYWORDS = [
+    # C keywords
+    'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
+    'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
+    'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
+    'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while',
+
+    # C++ keywords
+    'alignas', 'alignof', 'and', 'and_eq', 'asm', 'bitand', 'bitor', 'bool',
+    'catch', 'class', 'compl', 'const_cast', 'constexpr', 'decltype', 'delete',
+    'dynamic_cast', 'explicit', 'export', 'false', 'friend', 'inline', 'mutable',
+    'namespace', 'new', 'noexcept', 'not', 'not_eq', 'nullptr', 'operator', 'or',
+    'or_eq', 'private', 'protected', 'public', 'reinterpret_cast', 'static_assert',
+    'static_cast', 'template', 'this', 'thread_local', 'throw', 'true', 'try',
+    'typeid', 'typename', 'using', 'virtual', 'wchar_t', 'xor', 'xor_eq',
+
+    # Standard library functions
+    'printf', 'scanf', 'malloc', 'free', 'strlen', 'strcpy', 'strcmp', 'strcat',
+    'memcpy', 'memset', 'fopen', 'fclose', 'fread', 'fwrite', 'fprintf', 'fscanf',
+    'cout', 'cin', 'endl', 'std', 'vector', 'string', 'map', 'set', 'list',
+    'queue', 'stack', 'pair', 'make_pair', 'sort', 'find', 'push_back', 'size',
+    'empty', 'begin', 'end', 'insert', 'erase', 'clear'
+]
+
+_SYMBOL_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    # Variable names (simple heuristic)
+    r'\b(?:int|float|double|char|bool|string|auto)\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+    # Function names
+    r'\b(?:int|float|double|char|bool|void|string|auto)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(',
+    # Class names
+    r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+    # Struct names
+    r'struct\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+    # Namespace names
+    r'namespace\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+    # #include headers (without angle brackets or quotes)
+    r'#include\s*[<"]\s*([a-zA-Z0-9_\.]+)\s*[>"]',
+    # #define macros
+    r'#define\s+([a-zA-Z_][a-zA-Z0-9_]*)',
+))
+_ENUM_OPEN_RE = re.compile(r'enum\s*(?:[a-zA-Z_][a-zA-Z0-9_]*)?\s*\{')
+_IDENTIFIER_RE = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)')
+
+
+def extract_line_symbols(text, inside_enum=False):
+    """Return ``(symbols, inside_enum)`` for one line of C/C++.
+
+    ``inside_enum`` tells whether the line starts, and on return ends, inside
+    the braces of an enum, so enum values spread over several lines are found.
+    """
+    symbols = set()
+    for pattern in _SYMBOL_PATTERNS:
+        symbols.update(pattern.findall(text))
+
+    pos = 0
+    while True:
+        if not inside_enum:
+            match = _ENUM_OPEN_RE.search(text, pos)
+            if not match:
+                break
+            pos = match.end()
+            inside_enum = True
+        end = text.find('}', pos)
+        symbols.update(_IDENTIFIER_RE.findall(text, pos, len(text) if end == -1 else end))
+        if end == -1:
+            break
+        pos = end + 1
+        inside_enum = False
+
+    return [s for s in symbols if len(s) > 1], inside_enum
+
+
+class SymbolIndex:
+    """Completion symbols of a document, updated only for the blocks that change.
+
+    Each block keeps the symbols found on it; a count per symbol tells when
+    one appears in or disappears from the document. ``version`` is bumped
+    whenever the set of symbols changes. ``uses`` counts how often every
+    identifier occurs, for ranking, and ``uses_version`` is bumped whenever
+    those counts change.
+    """
+
+    def __init__(self, document, keywords=()):
+        self.document = document
+        self.version = 0
+        self.uses = Counter()
+        self.uses_version = 0
+        self._counts = Counter()
+        self._sorted = []
+        self._blocks = []  # per block: (symbols, inside_enum at the end of the line, identifiers)
+
+        for word in keywords:
+            self._add_symbol(word)
+        self._reindex(0, -1, document.blockCount() - 1)
+        document.contentsChange.connect(self._on_contents_change)
+
+    def symbols(self):
+        return list(self._sorted)
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        document = self.document
+        end = min(position + chars_added, document.characterCount() - 1)
+        first = document.findBlock(position).blockNumber()
+        new_last = document.findBlock(end).blockNumber()
+        old_last = new_last - (document.blockCount() - len(self._blocks))
+        old_last = max(first - 1, min(old_last, len(self._blocks) - 1))
+        self._reindex(first, old_last, new_last)
+
+    def _reindex(self, first, old_last, new_last):
+        # New symbols are counted before old ones are dropped, so a line that
+        # is retyped without changing its symbols leaves the set untouched
+        old_entries = self._blocks[first:old_last + 1]
+        old_inside_enum = old_entries[-1][1] if old_entries else False
+
+        inside_enum = self._blocks[first - 1][1] if first > 0 else False
+        entries = []
+        block = self.document.findBlockByNumber(first)
+        for _ in range(first, new_last + 1):
+            entry = self._index_block(block.text(), inside_enum)
+            inside_enum = entry[1]
+            entries.append(entry)
+            block = block.next()
+        self._blocks[first:old_last + 1] = entries
+
+        # An enum opened or closed on the changed lines shifts the lines after it
+        number = new_last + 1
+        while inside_enum != old_inside_enum and number < len(self._blocks):
+            old_entry = self._blocks[number]
+            old_inside_enum = old_entry[1]
+            entry = self._index_block(block.text(), inside_enum)
+            inside_enum = entry[1]
+            old_entries.append(old_entry)
+            entries.append(entry)
+            self._blocks[number] = entry
+            block = block.next()
+            number += 1
+
+        changed = False
+        for symbols, _, words in entries:
+            for symbol in symbols:
+                changed |= self._add_symbol(symbol)
+            self.uses.update(words)
+        for symbols, _, words in old_entries:
+            for symbol in symbols:
+                changed |= self._remove_symbol(symbol)
+            for word in words:
+                self.uses[word] -= 1
+                if not self.uses[word]:
+                    del self.uses[word]
+        if changed:
+            self.version += 1
+        self.uses_version += 1
+
+    def _index_block(self, text, inside_enum):
+        symbols, inside_enum = extract_line_symbols(text, inside_enum)
+        return symbols, inside_enum, tuple(map(sys.intern, _IDENTIFIER_RE.findall(text)))
+
+    def _add_symbol(self, symbol):
+        self._counts[symbol] += 1
+        if self._counts[symbol] == 1:
+            bisect.insort(self._sorted, symbol)
+            return True
+        return False
+
+    def _remove_symbol(self, symbol):
+        self._counts[symbol] -= 1
+        if self._counts[symbol] == 0:
+            del self._counts[symbol]
+            del self._sorted[bisect.bisect_left(self._sorted, symbol)]
+            return True
+        return False
+
+
+def rank_key(frequencies, recency):
+    """Sort key ordering completions by recency, then frequency, then name."""
+    return lambda symbol: (-recency.get(symbol, 0), -frequencies.get(symbol, 0),
+                           symbol.lower(), symbol)
+
+
+class CompletionEngine:
+    """Ranked prefix lookup over the symbols of a document.
+
+    Symbols are kept in an array sorted by their case-folded spelling, so the
+    symbols starting with a prefix form one contiguous slice found with two
+    binary searches. Only the best ``max_results`` of that slice are ranked
+    and returned: recently accepted completions first, then the identifiers
+    used most often in the file, then alphabetically.
+    """
+
+    def __init__(self, max_results=50):
+        self.max_results = max_results
+        self._folded = []
+        self._symbols = []
+        self._symbol_set = frozenset()
+
+    def set_symbols(self, symbols):
+        pairs = sorted((symbol.lower(), symbol) for symbol in symbols)
+        self._folded = [folded for folded, _ in pairs]
+        self._symbols = [symbol for _, symbol in pairs]
+        self._symbol_set = frozenset(self._symbols)
+
+    def complete(self, prefix, frequencies=None, recency=None):
+        folded = prefix.lower()
+        lo = bisect.bisect_left(self._folded, folded)
+        hi = bisect.bisect_left(self._folded, folded + '\U0010ffff', lo)
+        frequencies = frequencies or {}
+        recency = recency or {}
+
+        # Symbols that were never used or accepted rank after the others in
+        # plain array order, so only the scored ones need sorting. Find them
+        # through whichever is smaller: the matching slice or the score tables.
+        if hi - lo <= len(frequencies) + len(recency):
+            scored = [symbol for symbol in self._symbols[lo:hi]
+                      if symbol in recency or symbol in frequencies]
+        else:
+            scored = [symbol for symbol in itertools.chain(
+                          recency, (name for name in frequencies if name not in recency))
+                      if symbol in self._symbol_set and symbol.lower().startswith(folded)]
+
+        best = heapq.nsmallest(self.max_results, scored, key=rank_key(frequencies, recency))
+        if len(best) < self.max_results:
+            taken = set(best)
+            for i in range(lo, hi):
+                if self._symbols[i] not in taken:
+                    best.append(self._symbols[i])
+                    if len(best) == self.max_results:
+                        break
+        return best
+
+
+class CompletionWorker(QObject):
+    candidates_ready = pyqtSignal(int, str, object)
+
+    def __init__(self):
+        super().__init__()
+        self.engine = CompletionEngine()
+        self.workspace_engine = CompletionEngine()
+        self._version = None
+        self._workspace_version = None
+
+    @pyqtSlot(int, str, object)
+    def compute(self, generation, prefix, request):
+        version, symbols, frequencies, recency, workspace_version, workspace_symbols = request
+        if version != self._version:
+            self._version = version
+            self.engine.set_symbols(symbols)
+        # Symbols from the rest of the workspace change rarely and can be
+        # large, so they get their own engine instead of being merged in.
+        if workspace_version != self._workspace_version:
+            self._workspace_version = workspace_version
+            self.workspace_engine.set_symbols(workspace_symbols)
+        candidates = self.engine.complete(prefix, frequencies, recency)
+        if workspace_symbols:
+            candidates = heapq.nsmallest(
+                self.engine.max_results,
+                dict.fromkeys(candidates + self.workspace_engine.complete(prefix, frequencies, recency)),
+                key=rank_key(frequencies, recency))
+        self.candidates_ready.emit(generation, prefix, candidates)
+
+
+_completion_thread = None
+
+
+def completion_thread():
+    """Return the worker thread shared by every editor's CompletionWorker."""
+    global _completion_thread
+    if _completion_thread is None:
+        _completion_thread = QThread()
+        _completion_thread.start()
+        QCoreApplication.instance().aboutToQuit.connect(_stop_completion_thread)
+    return _completion_thread
+
+
+def _stop_completion_thread():
+    global _completion_thread
+    if _completion_thread is not None:
+        _completion_thread.quit()
+        _completion_thread.wait()
+        _completion_thread = None
+
+
 class LineNumberArea(QWidget):
     def __init__(self, editor):
         super().__init__(editor)
@@ -18,18 +309,50 @@ class LineNumberArea(QWidget):
     def paintEvent(self, event):
         self.codeEditor.line_number_area_paint_event(event)
 
+    def event(self, event):
+        if event.type() == QEvent.ToolTip:
+            text = self.codeEditor.diagnostic_tooltip(event.pos().y())
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
+
+# Most severe first; a line with several diagnostics shows the first of these
+DIAGNOSTIC_SEVERITIES = ('fatal error', 'error', 'warning', 'note')
+MARKER_COLORS = {'fatal error': '#d32f2f', 'error': '#d32f2f', 'warning': '#f9a825', 'note': '#1976d2'}
+
 
 class CodeEditor(QPlainTextEdit):
+    # Wait this long after the last keystroke before looking up completions
+    COMPLETION_DEBOUNCE_MS = 40
+    MARKER_WIDTH = 10
+    # typing_idle fires once the text has not changed for this long
+    TYPING_IDLE_MS = 500
+
+    completion_requested = pyqtSignal(int, str, object)
+    typing_idle = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.setFont(QFont("Consolas", 12))
         self.highlighter = CppHighlighter(self.document())
 
+        self.diagnostics = {}  # line number -> [(severity, message)], most severe first
+        self._diagnostic_selections = []
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(self.TYPING_IDLE_MS)
+        self._idle_timer.timeout.connect(self.typing_idle)
+        self.textChanged.connect(self._idle_timer.start)
         self.lineNumberArea = LineNumberArea(self)
         self.blockCountChanged.connect(self.update_line_number_area_width)
         self.updateRequest.connect(self.update_line_number_area)
         self.cursorPositionChanged.connect(self.highlight_current_line)
+        self.verticalScrollBar().valueChanged.connect(self.update_visible_highlighting)
         self.update_line_number_area_width(0)
         self.highlight_current_line()
 
@@ -41,6 +364,33 @@ class CodeEditor(QPlainTextEdit):
         self.completer.activated.connect(self.insert_completion)
         self.setup_completer_style()
 
+        self.symbol_index = SymbolIndex(self.document(), COMPLETION_KEYWORDS)
+        self._symbol_snapshot = ()
+        self._snapshot_version = -1
+        self._frequency_snapshot = {}
+        self._frequency_version = -1
+        self._workspace_symbols = ()
+        self._workspace_version = 0
+        self._recent_completions = OrderedDict()
+        self._recent_tick = 0
+
+        # Keystrokes restart the debounce timer; candidates are filtered on the
+        # worker thread and results from an older generation are dropped.
+        self._completion_generation = 0
+        self._completion_prefix = ""
+        self._keypress_time = 0.0
+        self.completion_latencies = deque(maxlen=500)
+        self._completion_timer = QTimer(self)
+        self._completion_timer.setSingleShot(True)
+        self._completion_timer.setInterval(self.COMPLETION_DEBOUNCE_MS)
+        self._completion_timer.timeout.connect(self.update_completions)
+
+        self._completion_worker = CompletionWorker()
+        self._completion_worker.moveToThread(completion_thread())
+        self.completion_requested.connect(self._completion_worker.compute)
+        self._completion_worker.candidates_ready.connect(self.show_completions)
+        self.destroyed.connect(self._completion_worker.deleteLater)
+
     def contextMenuEvent(self, event):
         menu = self.createStandardContextMenu()
         run_action = QAction("▶ Compile and Run", self)
@@ -54,9 +404,22 @@ class CodeEditor(QPlainTextEdit):
         menu.insertAction(menu.actions()[0], run_action)
         menu.exec_(event.globalPos())
 
+    def setPlainText(self, text):
+        if text.count('\n') >= self.highlighter.PROGRESSIVE_THRESHOLD:
+            self.highlighter.start_progressive()
+        super().setPlainText(text)
+        self.update_visible_highlighting()
+
+    def update_visible_highlighting(self, *_):
+        if not self.highlighter.is_progressive():
+            return
+        first = self.firstVisibleBlock()
+        last = self.cursorForPosition(QPoint(0, self.viewport().height())).block()
+        self.highlighter.set_visible_blocks(first.blockNumber(), last.blockNumber())
+
     def line_number_area_width(self):
         digits = len(str(max(1, self.blockCount())))
-        space = 10 + self.fontMetrics().horizontalAdvance('9') * digits
+        space = 10 + self.MARKER_WIDTH + self.fontMetrics().horizontalAdvance('9') * digits
         return space
 
     def update_line_number_area_width(self, _):
@@ -74,6 +437,7 @@ class CodeEditor(QPlainTextEdit):
         super().resizeEvent(event)
         cr = self.contentsRect()
         self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), self.line_number_area_width(), cr.height()))
+        self.update_visible_highlighting()
 
     def line_number_area_paint_event(self, event):
         painter = QPainter(self.lineNumberArea)
@@ -87,6 +451,12 @@ class CodeEditor(QPlainTextEdit):
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
                 number = str(blockNumber + 1)
+                markers = self.diagnostics.get(blockNumber + 1)
+                if markers:
+                    size = min(self.MARKER_WIDTH - 2, self.fontMetrics().height() - 4)
+                    painter.setPen(Qt.NoPen)
+                    painter.setBrush(QColor(MARKER_COLORS[markers[0][0]]))
+                    painter.drawEllipse(2, top + (self.fontMetrics().height() - size) // 2, size, size)
                 painter.setPen(Qt.darkGray)
                 painter.drawText(0, top, self.lineNumberArea.width() - 5, self.fontMetrics().height(),
                                  Qt.AlignRight, number)
@@ -95,6 +465,53 @@ class CodeEditor(QPlainTextEdit):
             bottom = top + int(self.blockBoundingRect(block).height())
             blockNumber += 1
 
+    def set_diagnostics(self, diagnostics):
+        """Show ``Diagnostic`` records of this file as gutter markers and wavy underlines."""
+        self.diagnostics = {}
+        self._diagnostic_selections = []
+        for diagnostic in diagnostics:
+            self.diagnostics.setdefault(diagnostic.line, []).append((diagnostic.severity, diagnostic.message))
+            if diagnostic.severity != 'note':
+                selection = self._underline(diagnostic)
+                if selection is not None:
+                    self._diagnostic_selections.append(selection)
+        for markers in self.diagnostics.values():
+            markers.sort(key=lambda marker: DIAGNOSTIC_SEVERITIES.index(marker[0]))
+        self.lineNumberArea.update()
+        self.highlight_current_line()
+
+    def _underline(self, diagnostic):
+        block = self.document().findBlockByNumber(diagnostic.line - 1)
+        if not block.isValid():
+            return None
+        column = min(max(0, diagnostic.column - 1), max(0, block.length() - 2))
+        # The selection's cursor moves with later edits, so the underline stays on its token
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, column)
+        cursor.movePosition(QTextCursor.EndOfWord, QTextCursor.KeepAnchor)
+        if not cursor.hasSelection():
+            cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor)
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = cursor
+        selection.format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
+        selection.format.setUnderlineColor(QColor(MARKER_COLORS[diagnostic.severity]))
+        return selection
+
+    def diagnostic_tooltip(self, y):
+        block = self.cursorForPosition(QPoint(0, y)).block()
+        markers = self.diagnostics.get(block.blockNumber() + 1)
+        return '\n'.join(f"{severity}: {message}" for severity, message in markers) if markers else None
+
+    def go_to_line(self, line, column=1):
+        block = self.document().findBlockByNumber(max(0, line - 1))
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, min(max(0, column - 1), block.length() - 1))
+        self.setTextCursor(cursor)
+        self.centerCursor()
+        self.setFocus()
+
     def highlight_current_line(self):
         if self.isReadOnly():
             return
@@ -104,7 +521,7 @@ class CodeEditor(QPlainTextEdit):
         selection.format.setProperty(QTextFormat.FullWidthSelection, True)
         selection.cursor = self.textCursor()
         selection.cursor.clearSelection()
-        self.setExtraSelections([selection])
+        self.setExtraSelections([selection] + self._diagnostic_selections)
 
     def setup_completer_style(self):
         popup = self.completer.popup()
@@ -169,71 +586,75 @@ class CodeEditor(QPlainTextEdit):
         tc.insertText(completion)
         self.setTextCursor(tc)
 
+        self._recent_tick += 1
+        self._recent_completions.pop(completion, None)
+        self._recent_completions[completion] = self._recent_tick
+        if len(self._recent_completions) > 100:
+            self._recent_completions.popitem(last=False)
+
     def textUnderCursor(self):
         tc = self.textCursor()
         tc.select(QTextCursor.WordUnderCursor)
         return tc.selectedText()
 
+    def request_completions(self, prefix):
+        self._completion_generation += 1
+        self._completion_prefix = prefix
+        self._keypress_time = time.perf_counter()
+        if self.completer.popup().isVisible():
+            self.completer.setCompletionPrefix(prefix)
+        self._completion_timer.start()
+
+    def cancel_completions(self):
+        self._completion_generation += 1
+        self._completion_timer.stop()
+        self.completer.popup().hide()
+
     def update_completions(self):
-        code = self.toPlainText()
-        
-        # C/C++ keywords and common functions
-        cpp_keywords = [
-            # C keywords
-            'auto', 'break', 'case', 'char', 'const', 'continue', 'default', 'do',
-            'double', 'else', 'enum', 'extern', 'float', 'for', 'goto', 'if',
-            'int', 'long', 'register', 'return', 'short', 'signed', 'sizeof', 'static',
-            'struct', 'switch', 'typedef', 'union', 'unsigned', 'void', 'volatile', 'while',
-            
-            # C++ keywords
-            'alignas', 'alignof', 'and', 'and_eq', 'asm', 'bitand', 'bitor', 'bool',
-            'catch', 'class', 'compl', 'const_cast', 'constexpr', 'decltype', 'delete',
-            'dynamic_cast', 'explicit', 'export', 'false', 'friend', 'inline', 'mutable',
-            'namespace', 'new', 'noexcept', 'not', 'not_eq', 'nullptr', 'operator', 'or',
-            'or_eq', 'private', 'protected', 'public', 'reinterpret_cast', 'static_assert',
-            'static_cast', 'template', 'this', 'thread_local', 'throw', 'true', 'try',
-            'typeid', 'typename', 'using', 'virtual', 'wchar_t', 'xor', 'xor_eq',
-            
-            # Standard library functions
-            'printf', 'scanf', 'malloc', 'free', 'strlen', 'strcpy', 'strcmp', 'strcat',
-            'memcpy', 'memset', 'fopen', 'fclose', 'fread', 'fwrite', 'fprintf', 'fscanf',
-            'cout', 'cin', 'endl', 'std', 'vector', 'string', 'map', 'set', 'list',
-            'queue', 'stack', 'pair', 'make_pair', 'sort', 'find', 'push_back', 'size',
-            'empty', 'begin', 'end', 'insert', 'erase', 'clear'
-        ]
-        
-        suggestions = set(cpp_keywords)
-        
-        # Extract variable names (simple heuristic)
-        suggestions.update(re.findall(r'\b(?:int|float|double|char|bool|string|auto)\s+([a-zA-Z_][a-zA-Z0-9_]*)', code))
-        
-        # Extract function names
-        suggestions.update(re.findall(r'\b(?:int|float|double|char|bool|void|string|auto)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\(', code))
-        
-        # Extract class names
-        suggestions.update(re.findall(r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)', code))
-        
-        # Extract struct names
-        suggestions.update(re.findall(r'struct\s+([a-zA-Z_][a-zA-Z0-9_]*)', code))
-        
-        # Extract namespace names
-        suggestions.update(re.findall(r'namespace\s+([a-zA-Z_][a-zA-Z0-9_]*)', code))
-        
-        # Extract #include headers (without angle brackets or quotes)
-        suggestions.update(re.findall(r'#include\s*[<"]\s*([a-zA-Z0-9_\.]+)\s*[>"]', code))
-        
-        # Extract #define macros
-        suggestions.update(re.findall(r'#define\s+([a-zA-Z_][a-zA-Z0-9_]*)', code))
-        
-        # Extract enum values
-        enum_matches = re.findall(r'enum\s*(?:[a-zA-Z_][a-zA-Z0-9_]*)?\s*\{([^}]+)\}', code)
-        for enum_body in enum_matches:
-            enum_values = re.findall(r'([a-zA-Z_][a-zA-Z0-9_]*)', enum_body)
-            suggestions.update(enum_values)
-        
-        suggestions = sorted([s for s in suggestions if s and len(s) > 1])
-        self.completer.model().setStringList(suggestions)
+        if self._snapshot_version != self.symbol_index.version:
+            self._snapshot_version = self.symbol_index.version
+            self._symbol_snapshot = tuple(self.symbol_index.symbols())
+        if self._frequency_version != self.symbol_index.uses_version:
+            self._frequency_version = self.symbol_index.uses_version
+            self._frequency_snapshot = dict(self.symbol_index.uses)
+        request = (self._snapshot_version, self._symbol_snapshot,
+                   self._frequency_snapshot, dict(self._recent_completions),
+                   self._workspace_version, self._workspace_symbols)
+        self.completion_requested.emit(
+            self._completion_generation, self._completion_prefix, request)
+
+    def set_workspace_symbols(self, symbols):
+        """Offer ``symbols`` from the other files of the open folder as completions."""
+        self._workspace_symbols = tuple(symbols)
+        self._workspace_version += 1
+
+    def show_completions(self, generation, prefix, candidates):
+        if generation != self._completion_generation:
+            return
+        if not candidates:
+            self.completer.popup().hide()
+            return
+
+        self.completer.model().setStringList(candidates)
+        self.completer.setCompletionPrefix(prefix)
+        rect = self.cursorRect()
+        rect.setWidth(
+            self.completer.popup().sizeHintForColumn(0) +
+            self.completer.popup().verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
+        self.completion_latencies.append((time.perf_counter() - self._keypress_time) * 1000)
 
+    def completion_latency_stats(self):
+        """Keypress-to-popup latency in milliseconds over the recent completions."""
+        samples = sorted(self.completion_latencies)
+        if not samples:
+            return {'count': 0}
+        return {
+            'count': len(samples),
+            'median': samples[len(samples) // 2],
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'max': samples[-1],
+        }
 
     def keyPressEvent(self, event):
         if self.completer.popup().isVisible():
@@ -241,7 +662,7 @@ class CodeEditor(QPlainTextEdit):
                 event.ignore()
                 return
             elif event.key() == Qt.Key_Escape:
-                self.completer.popup().hide()
+                self.cancel_completions()
                 return
             elif event.key() in (Qt.Key_Up, Qt.Key_Down):
                 event.ignore()
@@ -263,12 +684,6 @@ class CodeEditor(QPlainTextEdit):
         completion_prefix = tc.selectedText()
 
         if len(completion_prefix) >= 1 and (completion_prefix.isalnum() or '_' in completion_prefix):
-            self.update_completions()
-            self.completer.setCompletionPrefix(completion_prefix)
-            rect = self.cursorRect()
-            rect.setWidth(
-                self.completer.popup().sizeHintForColumn(0) +
-                self.completer.popup().verticalScrollBar().sizeHint().width())
-            self.completer.complete(rect)
+            self.request_completions(completion_prefix)
         else:
-            self.completer.popup().hide()
\ No newline at end of file
+            self.cancel_completions()
\ No newline at end of file
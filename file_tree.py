@@ -0,0 +1,350 @@
+import bisect
+import fnmatch
+import os
+import re
+import time
+
+from PyQt5.QtCore import (
+    Qt, QAbstractItemModel, QModelIndex, QObject, QThread, QCoreApplication,
+    QFileSystemWatcher, pyqtSignal, pyqtSlot
+)
+from PyQt5.QtWidgets import QFileIconProvider
+
+from build_profiles import ProjectConfig
+from workspace_index import SKIPPED_DIRS
+
+
+class IgnoreRules:
+    """Which paths under a folder are hidden.
+
+    Patterns follow .gitignore: ``name`` matches at any depth, a pattern
+    with a slash is relative to the folder, a trailing slash matches only
+    directories and ``!`` re-includes. They come from the built-in skipped
+    directories, the folder's top-level .gitignore and the "ignore" list of
+    its project config.
+    """
+
+    def __init__(self, root, patterns=None):
+        self.root = root
+        if patterns is None:
+            patterns = [name + '/' for name in sorted(SKIPPED_DIRS)]
+            patterns += self._read_gitignore(root)
+            patterns += ProjectConfig(root).data.get('ignore', [])
+        self.rules = [rule for rule in map(self._compile, patterns) if rule]
+
+    @staticmethod
+    def _read_gitignore(root):
+        try:
+            with open(os.path.join(root, '.gitignore'), 'r', encoding='utf-8', errors='replace') as f:
+                return f.read().splitlines()
+        except OSError:
+            return []
+
+    @staticmethod
+    def _compile(pattern):
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith('#'):
+            return None
+        negate = pattern.startswith('!')
+        pattern = pattern.lstrip('!')
+        directory_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/').replace('**/', '*')
+        if not pattern:
+            return None
+        return re.compile(fnmatch.translate(pattern)), negate, directory_only, anchored
+
+    def ignored(self, relative_path, is_dir):
+        """``relative_path`` uses forward slashes; its parents are assumed not ignored."""
+        name = relative_path.rsplit('/', 1)[-1]
+        result = False
+        for regex, negate, directory_only, anchored in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(relative_path if anchored else name):
+                result = not negate
+        return result
+
+
+class DirectoryScanner:
+    """Lists directories under ``rules.root`` for the file tree and Quick Open.
+
+    A linked directory counts as a directory, so both show the same files.
+    Meant for worker threads: the GUI thread gets the GIL every YIELD_EVERY
+    entries, counted across calls.
+    """
+    YIELD_EVERY = 1000
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._count = 0
+
+    def scan(self, relative):
+        """``(subdirectories, files)`` of ``relative`` (forward slashes, '' for the
+        root) that the rules keep, sorted case-insensitively; None if it cannot be listed."""
+        prefix = relative + '/' if relative else ''
+        directories, files = [], []
+        try:
+            with os.scandir(os.path.join(self.rules.root, relative)) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not self.rules.ignored(prefix + entry.name, is_dir):
+                        (directories if is_dir else files).append(entry.name)
+                    self._count += 1
+                    if self._count % self.YIELD_EVERY == 0:
+                        time.sleep(0)
+        except OSError:
+            return None
+        directories.sort(key=str.lower)
+        files.sort(key=str.lower)
+        return directories, files
+
+
+class DirectoryLister(QObject):
+    """Lists directories for LazyFileModel on a worker thread."""
+
+    listed = pyqtSignal(int, str, object)
+
+    @pyqtSlot(int, str, object)
+    def list_directory(self, generation, path, rules):
+        relative_dir = os.path.relpath(path, rules.root).replace(os.sep, '/')
+        listing = DirectoryScanner(rules).scan('' if relative_dir == '.' else relative_dir)
+        directories, files = listing or ([], [])  # removed or unreadable; shows as empty
+        self.listed.emit(generation, path, [(True, name) for name in directories] +
+                         [(False, name) for name in files])
+
+
+def entry_sort_key(entry):
+    """Directories first, then case-insensitive by name."""
+    is_dir, name = entry
+    return not is_dir, name.lower()
+
+
+_lister_thread = None
+
+
+def lister_thread():
+    global _lister_thread
+    if _lister_thread is None:
+        _lister_thread = QThread()
+        _lister_thread.start()
+        QCoreApplication.instance().aboutToQuit.connect(_stop_lister_thread)
+    return _lister_thread
+
+
+def _stop_lister_thread():
+    global _lister_thread
+    if _lister_thread is not None:
+        _lister_thread.quit()
+        _lister_thread.wait()
+        _lister_thread = None
+
+
+class _Node:
+    __slots__ = ('name', 'path', 'is_dir', 'parent', 'row', 'entries', 'children', 'loading')
+
+    def __init__(self, name, path, is_dir, parent, row):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = row
+        self.entries = None  # sorted (is_dir, name) of a listed directory
+        self.children = []  # nodes for the first rows of entries
+        self.loading = False
+
+    def make_child(self, row):
+        is_dir, name = self.entries[row]
+        return _Node(name, self.path + os.sep + name, is_dir, self, row)
+
+
+class LazyFileModel(QAbstractItemModel):
+    """File tree that lists a directory only when it is expanded.
+
+    Listing happens on a worker thread. Rows are handed to the view in
+    batches through canFetchMore/fetchMore, so a directory with 100k files
+    costs one batch until it is scrolled. Directories that have been listed
+    are watched, and their rows are updated in place when they change.
+    """
+    FETCH_BATCH = 1000
+
+    list_requested = pyqtSignal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = None
+        self._directories = {}  # path -> listed or loading directory node
+        self._generation = 0
+        self.ignore_rules = None
+        icons = QFileIconProvider()
+        self._folder_icon = icons.icon(QFileIconProvider.Folder)
+        self._file_icon = icons.icon(QFileIconProvider.File)
+
+        self._lister = DirectoryLister()
+        self._lister.moveToThread(lister_thread())
+        self.list_requested.connect(self._lister.list_directory)
+        self._lister.listed.connect(self._on_listed)
+        self.destroyed.connect(self._lister.deleteLater)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def setRootPath(self, path):
+        path = os.path.abspath(path)
+        self.beginResetModel()
+        self._generation += 1
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+        self._root = _Node(os.path.basename(path), path, True, None, 0)
+        self._directories = {}
+        self.ignore_rules = IgnoreRules(path)
+        self.endResetModel()
+        self._request(self._root)
+
+    def rootPath(self):
+        return self._root.path if self._root else ''
+
+    def filePath(self, index):
+        node = self._node(index)
+        return node.path if node else ''
+
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def _index_of(self, node):
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        node = self._node(parent)
+        if node is None or not 0 <= row < len(node.children) or column != 0:
+            return QModelIndex()
+        return self.createIndex(row, 0, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self._index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return len(node.children) if node is not None else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        # Unlisted directories are assumed to have children, so no disk access is needed
+        return node is not None and node.is_dir and (node.entries is None or bool(node.entries))
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        if node is None or not node.is_dir:
+            return False
+        if node.entries is None:
+            return not node.loading
+        return len(node.children) < len(node.entries)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if node is None or not node.is_dir:
+            return
+        if node.entries is None:
+            if not node.loading:
+                self._request(node)
+            return
+        first = len(node.children)
+        last = min(len(node.entries), first + self.FETCH_BATCH) - 1
+        if last >= first:
+            self.beginInsertRows(self._index_of(node), first, last)
+            node.children.extend(node.make_child(row) for row in range(first, last + 1))
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.DecorationRole:
+            return self._folder_icon if node.is_dir else self._file_icon
+        if role == Qt.ToolTipRole:
+            return node.path
+        return None
+
+    def _request(self, node):
+        node.loading = True
+        self._directories[node.path] = node
+        self.list_requested.emit(self._generation, node.path, self.ignore_rules)
+
+    def _on_listed(self, generation, path, entries):
+        node = self._directories.get(path)
+        if generation != self._generation or node is None:
+            return
+        node.loading = False
+        if node.entries is None:
+            node.entries = entries
+            if entries:
+                self.fetchMore(self._index_of(node))
+            else:
+                # Drop the expand arrow of a directory that turned out empty
+                index = self._index_of(node)
+                if index.isValid():
+                    self.dataChanged.emit(index, index)
+            self._watcher.addPath(path)
+        else:
+            self._merge(node, entries)
+
+    def _on_directory_changed(self, path):
+        node = self._directories.get(path)
+        if node is not None and node.entries is not None and not node.loading:
+            self._request(node)
+
+    def _merge(self, node, entries):
+        # Rows already handed to the view are updated in place; the rest of
+        # the listing is still fetched in batches later
+        parent_index = self._index_of(node)
+        fully_fetched = len(node.children) == len(node.entries)
+        wanted = set(entries)
+        for row in range(len(node.children) - 1, -1, -1):
+            child = node.children[row]
+            if (child.is_dir, child.name) not in wanted:
+                self.beginRemoveRows(parent_index, row, row)
+                del node.children[row]
+                self._forget(child)
+                self._renumber(node, row)
+                self.endRemoveRows()
+
+        present = {(child.is_dir, child.name) for child in node.children}
+        keys = [entry_sort_key((child.is_dir, child.name)) for child in node.children]
+        for is_dir, name in entries:
+            if (is_dir, name) in present:
+                continue
+            row = bisect.bisect(keys, entry_sort_key((is_dir, name)))
+            if row == len(node.children) and not fully_fetched:
+                continue
+            self.beginInsertRows(parent_index, row, row)
+            node.children.insert(row, _Node(name, node.path + os.sep + name, is_dir, node, row))
+            keys.insert(row, entry_sort_key((is_dir, name)))
+            self._renumber(node, row + 1)
+            self.endInsertRows()
+        node.entries = entries
+
+    @staticmethod
+    def _renumber(node, first):
+        for row in range(first, len(node.children)):
+            node.children[row].row = row
+
+    def _forget(self, node):
+        if not node.is_dir:
+            return
+        if self._directories.pop(node.path, None) is not None:
+            self._watcher.removePath(node.path)
+        for child in node.children:
+            self._forget(child)
@@ -3,15 +3,36 @@ import os
 from PyQt5.QtWidgets import (
     QMainWindow, QApplication, QFileDialog, QAction,
     QTabWidget, QTextEdit, QSplitter, QVBoxLayout, QWidget,
-    QMessageBox,QTreeView, QFileSystemModel,
+    QMessageBox,QTreeView,
     QHBoxLayout, QLineEdit, QPushButton, QLabel, QFrame,
-    QCheckBox, QShortcut, QMenu, QInputDialog, QToolButton,QTextEdit,QStackedWidget,QTabBar
+    QCheckBox, QShortcut, QMenu, QInputDialog, QToolButton,QTextEdit,QStackedWidget,QTabBar,
+    QActionGroup, QPlainTextEdit
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QObject,QProcess,QThread
+from PyQt5.QtCore import Qt, pyqtSignal, QObject,QProcess,QThread,QTimer
+from PyQt5 import sip
 from PyQt5.QtGui import QKeySequence, QFont, QTextCharFormat, QTextCursor, QColor, QTextDocument,QFont,QIcon
 from editor import CodeEditor
+from workspace_index import WorkspaceIndexer, cache_dir, SOURCE_EXTENSIONS
+from build_cache import BuildCache, build_key
+from project_build import ProjectBuilder
+from precompiled_header import precompiled_header_for
+from build_profiles import ProjectConfig, BUILTIN_PROFILES, DEFAULT_PROFILE
+from run_stats import ProcessMonitor, format_stats, format_history
+from benchmark import BenchmarkRunner, BenchmarkDialog
+from test_runner import TestRunner, discover_cases, DEFAULT_TIME_LIMIT, DEFAULT_MEMORY_LIMIT_MB
+from output_viewer import OutputViewer, head_and_tail
+from diagnostics import ProblemsPanel, DiagnosticParser, same_file
+from command_stream import stream_command, DEFAULT_COMPILE_TIMEOUT
+from file_tree import LazyFileModel
+from syntax_check import SyntaxChecker, UNSAVED_NAME
+from quick_open import QuickOpenIndex, QuickOpenDialog
+import tempfile
+import codecs
+from collections import deque
 import subprocess
-import psutil 
+import glob
+import re
+import shutil
 import time
 
 
@@ -29,29 +50,97 @@ class OutputEmitter(QObject):
     output_signal = pyqtSignal(str)
 
 
-def kill_process_using_file(file_path):
-    killed = False
-    for proc in psutil.process_iter(['pid', 'exe']):
+def fresh_output_path(output_exe):
+    """An unused sibling of ``output_exe``, for when the old binary cannot be replaced yet."""
+    base, ext = os.path.splitext(output_exe)
+    number = 1
+    while os.path.exists(f"{base}.run{number}{ext}"):
+        number += 1
+    return f"{base}.run{number}{ext}"
+
+
+def remove_stale_outputs(output_exe):
+    """Delete the siblings ``fresh_output_path`` made whose programs have since exited."""
+    base, ext = os.path.splitext(output_exe)
+    generated = re.compile(re.escape(base) + r'\.run\d+' + re.escape(ext))
+    for path in glob.glob(glob.escape(base) + '.run*' + glob.escape(ext)):
+        if not generated.fullmatch(path):
+            continue  # e.g. foo.runner.exe, which is not ours
         try:
-            if proc.info['exe'] and proc.info['exe'].lower() == file_path.lower():
-                proc.terminate()
-                try:
-                    proc.wait(timeout=3)
-                except psutil.TimeoutExpired:
-                    proc.kill()
-                killed = True
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
-    return killed
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class ProcessReaper(QObject):
+    """Stops programs without blocking the GUI thread.
+
+    A process gets ^C on stdin, then ``terminate()`` and finally ``kill()``,
+    each after a grace period, driven by timers and ``QProcess.finished``.
+    """
+    GRACE_MS = (500, 2000)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._stopping = {}  # process -> [escalations so far, delete once finished]
+
+    def stop(self, process, dispose=True):
+        """Stop ``process``; with ``dispose`` the reaper also deletes it afterwards."""
+        if process in self._stopping:
+            self._stopping[process][1] |= dispose
+            return
+        if process.state() == QProcess.NotRunning:
+            if dispose:
+                process.deleteLater()
+            return
+        self._stopping[process] = [0, dispose]
+        process.finished.connect(lambda *_: self._reaped(process))
+        try:
+            process.write(b'\x03')
+        except Exception:
+            pass
+        QTimer.singleShot(self.GRACE_MS[0], lambda: self._escalate(process))
+
+    def _escalate(self, process):
+        state = self._stopping.get(process)
+        if state is None:
+            return
+        if state[0] == 0:
+            process.terminate()
+            state[0] = 1
+            QTimer.singleShot(self.GRACE_MS[1], lambda: self._escalate(process))
+        else:
+            process.kill()
+
+    def _reaped(self, process):
+        state = self._stopping.pop(process, None)
+        if state is not None and state[1]:
+            process.deleteLater()
+
+    def kill_all(self):
+        """Kill whatever is still shutting down; only for when the editor exits."""
+        for process in list(self._stopping):
+            process.kill()
+            process.waitForFinished(1000)
 
 
 class CppRunner(QThread):
     output_signal = pyqtSignal(str)
     process_created = pyqtSignal(str)  
+    diagnostics_ready = pyqtSignal(object)
+    # File name and seconds spent compiling it so far; -1 once it is done
+    compile_progress = pyqtSignal(str, float)
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, build_cache=None, use_pch=False, profile=DEFAULT_PROFILE, flags=(),
+                 output_exe=None, compile_timeout=DEFAULT_COMPILE_TIMEOUT):
         super().__init__()
+        self.compile_timeout = compile_timeout
         self.file_path = file_path
+        self.build_cache = build_cache
+        self.use_pch = use_pch
+        self.profile = profile
+        self.flags = list(flags)
+        self.output_exe = output_exe
 
     def run(self):
         if not self.file_path or not os.path.exists(self.file_path):
@@ -64,54 +153,85 @@ class CppRunner(QThread):
             return
 
         filename = os.path.basename(self.file_path)
-        output_exe = self.file_path.replace(file_ext, '.exe')
+        output_exe = self.output_exe or self.file_path.replace(file_ext, '.exe')
         
-        self.output_signal.emit(f"--- Compiling {filename} ---\n")
-
-        if os.path.exists(output_exe):
-            self.output_signal.emit("Stopping any running instances...\n")
-            kill_process_using_file(output_exe)
-            time.sleep(0.5)
-            
-
-            max_attempts = 3
-            for attempt in range(max_attempts):
-                try:
-                    os.remove(output_exe)
-                    break
-                except PermissionError:
-                    if attempt < max_attempts - 1:
-                        self.output_signal.emit(f"Waiting for file access... (attempt {attempt + 1})\n")
-                        time.sleep(1)
-                    else:
-                        self.output_signal.emit(f"Warning: Could not delete old executable.\n")
-                except Exception as e:
-                    self.output_signal.emit(f"Error removing old executable: {e}\n")
-                    break
-
         compiler = 'gcc' if file_ext == '.c' else 'g++'
-        compile_cmd = [compiler, self.file_path, '-o', output_exe]
-        
+        cache_key = None
+        if self.build_cache is not None:
+            cache_key = build_key(self.file_path, [compiler] + self.flags, compiler)
+        # An executable the cache placed there for this exact build is kept
+        reuse_exe = cache_key is not None and self.build_cache.is_current(cache_key, output_exe)
+
+        remove_stale_outputs(output_exe)
+        if os.path.exists(output_exe) and not reuse_exe:
+            try:
+                os.remove(output_exe)
+            except OSError:
+                # Still held by the previous run, which is being stopped in
+                # the background; build next to it instead of waiting
+                output_exe = fresh_output_path(output_exe)
+                self.output_signal.emit(f"Previous executable is busy, building {os.path.basename(output_exe)}\n")
+        compile_cmd = [compiler] + self.flags + [self.file_path, '-o', output_exe]
+
+        if cache_key:
+            if self.build_cache.fetch(cache_key, output_exe):
+                self.output_signal.emit(f"--- Build cache hit: reusing previous build of {filename} ---\n")
+                self.output_signal.emit(f"Build cache: {self.build_cache.stats()}\n\n")
+                self.process_created.emit(output_exe)
+                return
+            self.output_signal.emit(f"Build cache miss ({self.build_cache.stats()})\n")
+
+        pch = precompiled_header_for(self.file_path, compiler, self.flags) if self.use_pch else None
+        pch_reused = pch is not None and pch.is_built()
+        if pch is not None and not pch_reused:
+            self.output_signal.emit(f"Building precompiled header for {len(pch.includes)} includes...\n")
+            pch_start = time.perf_counter()
+            error = pch.build()
+            if error:
+                self.output_signal.emit(f"Warning: Precompiled header failed, compiling without it.\n{error}\n")
+                pch = None
+            else:
+                self.output_signal.emit(f"Precompiled header built in {time.perf_counter() - pch_start:.2f}s\n")
+        if pch is not None:
+            compile_cmd = [compiler] + self.flags + pch.include_args + [self.file_path, '-o', output_exe]
+
+        self.output_signal.emit(f"--- Compiling {filename} ({self.profile} profile) ---\n")
         self.output_signal.emit(f"Running: {' '.join(compile_cmd)}\n")
         self.output_signal.emit("\n")
         
+        parser = DiagnosticParser(os.path.dirname(self.file_path))
+        diagnostics = []
+
+        def on_output(text):
+            self.output_signal.emit(text)
+            diagnostics.extend(parser.feed(text))
+
         try:
-            compile_result = subprocess.run(compile_cmd, capture_output=True, text=True, timeout=30)
-            
-            if compile_result.returncode != 0:
+            compile_start = time.perf_counter()
+            returncode = stream_command(compile_cmd, on_output, self.compile_timeout,
+                                        self.isInterruptionRequested,
+                                        lambda elapsed: self.compile_progress.emit(filename, elapsed))
+            compile_seconds = time.perf_counter() - compile_start
+            self.compile_progress.emit(filename, -1.0)
+            diagnostics.extend(parser.finish())
+            self.diagnostics_ready.emit(diagnostics)
+
+            if returncode is None:
+                self.output_signal.emit("--- Compilation cancelled ---\n")
+                return
+            if returncode != 0:
                 self.output_signal.emit("--- Compilation Failed ---\n")
-                self.output_signal.emit(compile_result.stderr)
-                if compile_result.stdout:
-                    self.output_signal.emit(compile_result.stdout)
                 return
             else:
-                self.output_signal.emit("--- Compilation Successful ---\n")
+                self.output_signal.emit(f"--- Compilation Successful ({compile_seconds:.2f}s) ---\n")
+                if pch_reused:
+                    self.output_signal.emit(
+                        f"The precompiled header saved about {pch.parse_seconds:.2f}s of header parsing\n")
                 self.output_signal.emit(" ")
-                if compile_result.stdout:
-                    self.output_signal.emit(compile_result.stdout)
                 
         except subprocess.TimeoutExpired:
-            self.output_signal.emit("Error: Compilation timed out.\n")
+            self.compile_progress.emit(filename, -1.0)
+            self.output_signal.emit(f"Error: Compilation timed out after {self.compile_timeout:g}s.\n")
             return
         except Exception as e:
             self.output_signal.emit(f"Error during compilation: {e}\n")
@@ -119,16 +239,31 @@ class CppRunner(QThread):
         if not os.path.exists(output_exe):
             self.output_signal.emit("Error: Executable was not created.\n")
             return
+        if cache_key:
+            self.build_cache.store(cache_key, output_exe)
 
         self.output_signal.emit("\n")
         self.process_created.emit(output_exe)
 
 
-class TerminalWidget(QTextEdit):
+class TerminalWidget(QPlainTextEdit):
+    # Output is collected and inserted at most once per this many milliseconds,
+    # and a single insert is cut to roughly this many milliseconds of work
+    FLUSH_INTERVAL_MS = 25
+    FLUSH_BUDGET_MS = 10
+    DEFAULT_SCROLLBACK_LINES = 10000
+    CAPTURE_PREVIEW_LINES = 20
+    CAPTURE_FILES_KEPT = 10
+    STDIN_CHUNK_BYTES = 64 * 1024
+
+    output_captured = pyqtSignal(str)
+    diagnostics_ready = pyqtSignal(object)
+    compile_progress = pyqtSignal(str, float)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #d4d4d4;
                 font-family: 'Consolas', 'Courier New', monospace;
@@ -141,11 +276,53 @@ class TerminalWidget(QTextEdit):
         
         self.command_buffer = ""
         self.runner = None
+        self.pending_builds = None
         self.running_program = False
         self.cpp_process = None
+        self.build_cache = BuildCache()
+        self.use_precompiled_headers = True
+        self.compile_timeout = DEFAULT_COMPILE_TIMEOUT
+        self.monitor = ProcessMonitor(self)
+        # Stopped programs and threads finish shutting down in the background
+        self.reaper = ProcessReaper(self)
+        self.retired_runners = set()
+        self.run_source = None
+        self.run_history = {}  # source file or project folder -> recent run stats
         
         self.setUndoRedoEnabled(False)
 
+        # The document drops its oldest lines past the scrollback limit, and
+        # output that would be dropped right away is never inserted at all;
+        # the next flush then replaces the document with a marker and the rest
+        self.scrollback_lines = self.DEFAULT_SCROLLBACK_LINES
+        self.setMaximumBlockCount(self.scrollback_lines)
+        self.spill_file = None
+        self.dropped_lines = 0
+        self._unshown_dropped = 0
+        # In capture mode the program writes straight to a file and the
+        # terminal only shows its head and tail once it exits
+        self.capture_to_file = False
+        self.capture_path = None
+        # Source file -> file attached as the program's stdin, and the
+        # input typed during the last run of each source for replaying
+        self.stdin_files = {}
+        self.replay_input = False
+        self.last_input = {}
+        self._typed_input = []
+        self._stdin_data = None
+        self._stdin_offset = 0
+
+        self._pending_output = deque()
+        self._pending_lines = 0
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_output)
+        self._chars_per_ms = 2000.0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.output_lines = 0
+        self.output_flushes = 0
+        self.output_flush_seconds = 0.0
+
         self.process = QProcess(self)
         self.process.setProgram("cmd.exe")
         self.process.setWorkingDirectory(os.getcwd())
@@ -155,29 +332,77 @@ class TerminalWidget(QTextEdit):
 
     def start_cpp_process(self, exe_path):
         if self.cpp_process is not None:
-            self.stop_cpp_process()
-            
+            self.retire_cpp_process()
+
         self.cpp_process = QProcess(self)
+        self._decoder.reset()
         self.cpp_process.setProgram(exe_path)
         self.cpp_process.setWorkingDirectory(os.path.dirname(exe_path))
         self.cpp_process.setProcessChannelMode(QProcess.MergedChannels)
 
-        self.cpp_process.readyReadStandardOutput.connect(self.read_cpp_output)
+        self.capture_path = self.new_capture_path(exe_path) if self.capture_to_file else None
+        if self.capture_path:
+            self.cpp_process.setStandardOutputFile(self.capture_path)
+            self.append_output(f"--- Writing program output to {self.capture_path} ---\n")
+        else:
+            self.cpp_process.readyReadStandardOutput.connect(self.read_cpp_output)
+
+        self._typed_input = []
+        replay = None
+        stdin_file = self.stdin_files.get(self.run_source)
+        if stdin_file:
+            self.cpp_process.setStandardInputFile(stdin_file)
+            self.append_output(f"--- Reading stdin from {stdin_file} ---\n")
+        elif self.replay_input and self.last_input.get(self.run_source):
+            replay = self.last_input[self.run_source]
         self.cpp_process.finished.connect(self.on_cpp_finished)
         self.cpp_process.errorOccurred.connect(self.on_cpp_error)
 
         self.cpp_process.start()
         
         if self.cpp_process.waitForStarted(3000):
+            self.running_program = True
+            self.monitor.start(self.cpp_process.processId())
             self.append_output(" ")
+            if replay:
+                self.append_output(f"--- Replaying {len(replay)} bytes of input from the last run ---\n")
+                self._typed_input.append(replay)
+                self.feed_stdin(replay)
         else:
             self.append_output("Error: Failed to start the executable.\n")
             self.running_program = False
 
+    def feed_stdin(self, data):
+        """Write ``data`` to the program a chunk at a time, as fast as it reads it."""
+        self._stdin_data = memoryview(data)
+        self._stdin_offset = 0
+        self.cpp_process.bytesWritten.connect(self._write_stdin_chunk)
+        self._write_stdin_chunk()
+
+    def _write_stdin_chunk(self, _written=0):
+        process = self.cpp_process
+        if process is None or self._stdin_data is None or process.state() != QProcess.Running:
+            return
+        # Only keep one chunk queued in QProcess; the next goes out on bytesWritten
+        while self._stdin_offset < len(self._stdin_data) and process.bytesToWrite() < self.STDIN_CHUNK_BYTES:
+            chunk = self._stdin_data[self._stdin_offset:self._stdin_offset + self.STDIN_CHUNK_BYTES]
+            process.write(chunk.tobytes())
+            self._stdin_offset += len(chunk)
+        if self._stdin_offset >= len(self._stdin_data):
+            self._stdin_data = None
+
+    def set_stdin_file(self, source, path):
+        if path:
+            self.stdin_files[source] = path
+            self.append_output(f"{os.path.basename(source)} will read stdin from {path}\n")
+        elif self.stdin_files.pop(source, None):
+            self.append_output(f"{os.path.basename(source)} reads stdin from the terminal again\n")
+
     def read_cpp_output(self):
         try:
             if self.cpp_process and self.cpp_process.state() == QProcess.Running:
-                output = self.cpp_process.readAllStandardOutput().data().decode("utf-8", errors='replace')
+                # Multi-byte characters may be split across reads
+                output = self._decoder.decode(self.cpp_process.readAllStandardOutput().data())
                 if output:
                     self.append_output(output)
         except:
@@ -185,6 +410,7 @@ class TerminalWidget(QTextEdit):
 
     def on_cpp_finished(self, exit_code, exit_status):
         self.running_program = False
+        stats = self.monitor.stop()
         
         if exit_status == QProcess.NormalExit:
             if exit_code == 0:
@@ -195,6 +421,56 @@ class TerminalWidget(QTextEdit):
         else: 
             self.append_output("\n--- Process finished with exit code: {exit_code} ---\n")
 
+        if self.capture_path:
+            self.show_captured_output(self.capture_path)
+
+        self._stdin_data = None
+        if self._typed_input and self.run_source not in self.stdin_files:
+            self.last_input[self.run_source] = b''.join(self._typed_input)
+
+        if stats:
+            stats['exit_code'] = exit_code
+            self.append_output(format_stats(stats) + "\n")
+            history = self.run_history.setdefault(self.run_source, deque(maxlen=50))
+            if history:
+                self.append_output(f"previous run: wall {history[-1]['wall'] * 1000:.1f} ms, "
+                                   f"best: {min(s['wall'] for s in history) * 1000:.1f} ms\n")
+            history.append(stats)
+
+    def new_capture_path(self, exe_path):
+        directory = cache_dir('output')
+        old = sorted((os.path.join(directory, name) for name in os.listdir(directory)), key=os.path.getmtime)
+        for path in old[:max(0, len(old) - self.CAPTURE_FILES_KEPT + 1)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # still open in a viewer on Windows
+        name = os.path.splitext(os.path.basename(exe_path))[0]
+        return os.path.join(directory, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.log")
+
+    def show_captured_output(self, path):
+        try:
+            size = os.path.getsize(path)
+            head, tail = head_and_tail(path, self.CAPTURE_PREVIEW_LINES)
+        except OSError as e:
+            self.append_output(f"Could not read captured output: {e}\n")
+            return
+        self.append_output(f"--- Captured {size / (1024 * 1024):.1f} MB of output in {path} ---\n")
+        self.append_output(head)
+        if tail:
+            if not head.endswith('\n'):
+                self.append_output("\n")
+            self.append_output("...\n")
+            self.append_output(tail)
+        self.output_captured.emit(path)
+
+    def show_run_history(self, source):
+        history = self.run_history.get(source)
+        if not history:
+            self.append_output(f"No runs of {os.path.basename(source)} yet.\n")
+            return
+        self.append_output(format_history(os.path.basename(source), history))
+
     def on_cpp_error(self, error):
         self.running_program = False
         error_messages = {
@@ -210,32 +486,133 @@ class TerminalWidget(QTextEdit):
         self.append_output(f"\n--- Error: {error_msg} ---\n")
 
     def stop_cpp_process(self):
-        if self.cpp_process is not None:
+        """Interrupt the program; its exit is reported by on_cpp_finished as usual."""
+        if self.cpp_process is not None and self.cpp_process.state() != QProcess.NotRunning:
+            self.reaper.stop(self.cpp_process, dispose=False)
+
+    def retire_cpp_process(self):
+        """Detach the program from the terminal and let the reaper finish it off."""
+        process, self.cpp_process = self.cpp_process, None
+        self.running_program = False
+        self._stdin_data = None
+        self.monitor.stop()
+        for signal, slot in ((process.readyReadStandardOutput, self.read_cpp_output),
+                             (process.finished, self.on_cpp_finished),
+                             (process.errorOccurred, self.on_cpp_error),
+                             (process.bytesWritten, self._write_stdin_chunk)):
             try:
-                if self.cpp_process.state() == QProcess.Running:
-                    self.cpp_process.write(b'\x03')
-
-                    if not self.cpp_process.waitForFinished(500):
-                        self.cpp_process.terminate()
-                        if not self.cpp_process.waitForFinished(2000):
-                            self.cpp_process.kill()
-                            self.cpp_process.waitForFinished(1000)
-                            
-                self.cpp_process.deleteLater()
-                self.cpp_process = None
-            except Exception as e:
-                print(f"Error stopping C++ process: {e}")
-            finally:
-                self.running_program = False
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # not connected
+        self.reaper.stop(process)
 
     def append_output(self, text):
-        self.moveCursor(QTextCursor.End)
-        self.insertPlainText(text)
+        if not text:
+            return
+        if self.spill_file is not None:
+            self.spill_file.write(text)
+        self._pending_output.append(text)
+        self._pending_lines += text.count('\n')
+        if self._pending_lines > self.scrollback_lines:
+            # Leave room for the marker line and the unfinished last line
+            self._drop_pending_lines(self._pending_lines - max(self.scrollback_lines - 2, 0))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_INTERVAL_MS)
+
+    def _drop_pending_lines(self, count):
+        """Discard the oldest ``count`` lines of buffered output."""
+        pending = self._pending_output
+        dropped = 0
+        while pending and dropped < count:
+            lines = pending[0].count('\n')
+            if dropped + lines <= count:
+                pending.popleft()
+                dropped += lines
+            else:
+                pending[0] = pending[0].split('\n', count - dropped)[-1]
+                dropped = count
+        self._pending_lines -= dropped
+        self.dropped_lines += dropped
+        self._unshown_dropped += dropped
+
+    def _take_pending(self, limit):
+        """Pop up to ``limit`` characters of buffered output, preferably ending at a newline."""
+        parts = []
+        size = 0
+        pending = self._pending_output
+        while pending and size < limit:
+            part = pending.popleft()
+            if size + len(part) > limit:
+                cut = part.rfind('\n', 0, limit - size) + 1 or limit - size
+                pending.appendleft(part[cut:])
+                part = part[:cut]
+            parts.append(part)
+            size += len(part)
+        text = ''.join(parts)
+        self._pending_lines -= text.count('\n')
+        return text
+
+    def set_scrollback_lines(self, lines):
+        self.scrollback_lines = lines
+        self.setMaximumBlockCount(lines)
+
+    def set_spill_to_file(self, enabled):
+        """Also write all output to a temp file, so nothing past the scrollback is lost."""
+        if enabled and self.spill_file is None:
+            self.spill_file = tempfile.NamedTemporaryFile(
+                'w', encoding='utf-8', prefix='cpp_editor_output_', suffix='.log', delete=False)
+            self.append_output(f"Saving full output to {self.spill_file.name}\n")
+        elif not enabled and self.spill_file is not None:
+            spill_file, self.spill_file = self.spill_file, None
+            spill_file.close()
+            self.append_output(f"Full output saved in {spill_file.name}\n")
+
+    def flush_output(self, everything=False):
+        """Insert buffered output into the widget with a single insert.
+
+        Inserting is what costs time, so one flush only takes as much text as
+        fits in FLUSH_BUDGET_MS at the measured insert speed; a backlog is
+        worked off in further flushes that let input and painting run between.
+        """
+        self._flush_timer.stop()
+        if not self._pending_output:
+            return
+        start = time.perf_counter()
+        limit = float('inf') if everything else max(1024, int(self._chars_per_ms * self.FLUSH_BUDGET_MS))
+        text = self._take_pending(limit)
+        if self._unshown_dropped:
+            # What the document holds is older than the dropped lines
+            self.clear()
+            text = f"[{self._unshown_dropped} lines dropped]\n" + text
+            self._unshown_dropped = 0
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
         self.moveCursor(QTextCursor.End)
         self.ensureCursorVisible()
 
+        elapsed = time.perf_counter() - start
+        if len(text) >= 1024:
+            self._chars_per_ms = 0.7 * self._chars_per_ms + 0.3 * len(text) / max(elapsed * 1000, 0.01)
+        self.output_lines += text.count('\n')
+        self.output_flushes += 1
+        self.output_flush_seconds += elapsed
+        if self.spill_file is not None:
+            self.spill_file.flush()
+        if self._pending_output:
+            self._flush_timer.start(0)
+
+    def output_throughput(self):
+        """Lines per second spent inserting output, over the widget's lifetime."""
+        if not self.output_flush_seconds:
+            return 0.0
+        return self.output_lines / self.output_flush_seconds
+
     def keyPressEvent(self, event):
         key = event.key()
+        # Typed text goes after anything still waiting to be shown
+        self.flush_output(everything=True)
 
         if event.key() == Qt.Key_C and event.modifiers() == Qt.ControlModifier:
             if self.running_program and self.cpp_process:
@@ -247,7 +624,9 @@ class TerminalWidget(QTextEdit):
             if key == Qt.Key_Return or key == Qt.Key_Enter:
                 input_text = self.command_buffer
                 try:
-                    self.cpp_process.write((input_text + "\n").encode("utf-8"))
+                    data = (input_text + "\n").encode("utf-8")
+                    self.cpp_process.write(data)
+                    self._typed_input.append(data)
                     self.append_output(input_text + "\n")
                 except:
                     pass
@@ -298,6 +677,9 @@ class TerminalWidget(QTextEdit):
             self.insertPlainText(text)
 
     def clear_terminal(self):
+        self._pending_output.clear()
+        self._pending_lines = 0
+        self._unshown_dropped = 0
         self.clear()
         self.command_buffer = ""
         self.append_output(f"\n{os.getcwd()}> ")
@@ -316,12 +698,93 @@ class TerminalWidget(QTextEdit):
             except:
                 pass
 
-    def run_cpp_code(self, file_path):
+    def run_cpp_code(self, file_path, profile=DEFAULT_PROFILE, flags=()):
         self.stop_all_processes()
+        self.run_source = file_path
             
-        self.runner = CppRunner(file_path)
+        self.runner = CppRunner(file_path, self.build_cache, self.use_precompiled_headers, profile, flags,
+                                compile_timeout=self.compile_timeout)
+        self.runner.output_signal.connect(self.append_output)
+        self.runner.process_created.connect(self.start_cpp_process)
+        self.runner.diagnostics_ready.connect(self.diagnostics_ready)
+        self.runner.compile_progress.connect(self.compile_progress)
+        self.runner.finished.connect(self.on_runner_finished)
+        self.runner.start()
+
+    def run_project(self, folder, run_after_build=True, profile=DEFAULT_PROFILE, flags=()):
+        self.stop_all_processes()
+        self.run_source = folder
+
+        self.runner = ProjectBuilder(folder, run_after_build, profile=profile, flags=flags,
+                                     compile_timeout=self.compile_timeout)
         self.runner.output_signal.connect(self.append_output)
         self.runner.process_created.connect(self.start_cpp_process)
+        self.runner.diagnostics_ready.connect(self.diagnostics_ready)
+        self.runner.finished.connect(self.on_runner_finished)
+        self.runner.start()
+
+    def run_benchmark(self, builds, runs, warmup, stdin_path=None, temp_dir=None):
+        """Compile every ``(label, file_path, profile, flags)`` build, then benchmark them.
+
+        ``temp_dir`` is removed when the comparison ends, however it ends.
+        """
+        builds = [(label, file_path, profile, flags, f"{os.path.splitext(file_path)[0]}.{label}.bench.exe")
+                  for label, file_path, profile, flags in builds]
+        self.build_then(builds, lambda ready: self.start_runner(
+            BenchmarkRunner(ready, runs, warmup, stdin_path, temp_dir)), temp_dir)
+
+    def run_tests(self, file_path, profile, flags, cases, time_limit, memory_limit_mb):
+        self.build_then([(profile, file_path, profile, flags, None)], lambda ready: self.start_runner(
+            TestRunner(ready[0][1], cases, time_limit, memory_limit_mb)))
+
+    def build_then(self, builds, on_built, temp_dir=None):
+        """Compile ``(label, file_path, profile, flags, output_exe)`` builds one after
+        another, then call ``on_built`` with ``[(label, exe_path)]``.
+
+        ``temp_dir`` is removed if the builds fail or are stopped; once they are
+        done it belongs to whatever ``on_built`` starts."""
+        self.stop_all_processes()
+        self.pending_builds = {'pending': list(builds), 'ready': [], 'total': len(builds),
+                               'on_built': on_built, 'temp_dir': temp_dir}
+        self.build_next()
+
+    def build_next(self):
+        builds = self.pending_builds
+        if not builds['pending']:
+            builds['temp_dir'] = None
+            builds['on_built'](builds['ready'])
+            return
+
+        label, file_path, profile, flags, output_exe = builds['pending'].pop(0)
+        self.run_source = file_path
+        self.runner = CppRunner(file_path, self.build_cache, self.use_precompiled_headers,
+                                profile, flags, output_exe, self.compile_timeout)
+        self.runner.output_signal.connect(self.append_output)
+        self.runner.process_created.connect(lambda exe: builds['ready'].append((label, exe)))
+        self.runner.diagnostics_ready.connect(self.diagnostics_ready)
+        self.runner.compile_progress.connect(self.compile_progress)
+        self.runner.finished.connect(self.on_build_finished)
+        self.runner.start()
+
+    def on_build_finished(self):
+        if self.sender() is not self.runner:
+            return  # stopped by a newer run
+        self.on_runner_finished()
+        if len(self.pending_builds['ready']) + len(self.pending_builds['pending']) < self.pending_builds['total']:
+            self.append_output("--- Stopped: build failed ---\n")
+            self.remove_build_temp_dir()
+            return
+        self.build_next()
+
+    def remove_build_temp_dir(self):
+        builds = self.pending_builds
+        if builds and builds['temp_dir']:
+            shutil.rmtree(builds['temp_dir'], ignore_errors=True)
+            builds['temp_dir'] = None
+
+    def start_runner(self, runner):
+        self.runner = runner
+        self.runner.output_signal.connect(self.append_output)
         self.runner.finished.connect(self.on_runner_finished)
         self.runner.start()
 
@@ -334,38 +797,37 @@ class TerminalWidget(QTextEdit):
             pass
 
     def stop_all_processes(self):
+        """Stop the current program and build without waiting for either."""
         if self.cpp_process is not None:
-            try:
-                if self.cpp_process.state() == QProcess.Running:
-                    self.cpp_process.write(b'\x03') 
-
-                    if not self.cpp_process.waitForFinished(500):
-                        self.cpp_process.terminate()
-                        if not self.cpp_process.waitForFinished(2000):
-                            self.cpp_process.kill()
-                            self.cpp_process.waitForFinished(1000)
-                            
-                self.cpp_process.deleteLater()
-                self.cpp_process = None
-            except Exception as e:
-                print(f"Error stopping C++ process: {e}")
-            finally:
-                self.running_program = False
+            self.retire_cpp_process()
 
         if self.runner is not None:
-            try:
-                if self.runner.isRunning():
-                    self.runner.requestInterruption()
-                    self.runner.quit()
+            runner, self.runner = self.runner, None
+            for signal in (runner.output_signal, getattr(runner, 'process_created', None),
+                           getattr(runner, 'diagnostics_ready', None),
+                           getattr(runner, 'compile_progress', None), runner.finished):
+                try:
+                    if signal is not None:
+                        signal.disconnect()
+                except TypeError:
+                    pass
+            if runner.isRunning():
+                runner.requestInterruption()
+                self.retired_runners.add(runner)
+                runner.finished.connect(lambda: self._runner_retired(runner))
+            else:
+                runner.deleteLater()
+        self.remove_build_temp_dir()
 
-                    if not self.runner.wait(3000):
-                        self.runner.terminate()
-                        self.runner.wait(1000)
-                        
-                self.runner.deleteLater()
-                self.runner = None
-            except Exception as e:
-                print(f"Error stopping runner thread: {e}")
+    def _runner_retired(self, runner):
+        self.retired_runners.discard(runner)
+        runner.deleteLater()
+
+    def finish_stopped_processes(self):
+        """Kill programs still being reaped and wait for retired builds; only for when the editor exits."""
+        self.reaper.kill_all()
+        for runner in list(self.retired_runners):
+            runner.wait()
 
     def read_terminal_output(self):
         try:
@@ -379,7 +841,8 @@ class TerminalWidget(QTextEdit):
     def closeEvent(self, event):
         try:
             self.stop_all_processes()
-            
+            self.finish_stopped_processes()
+
             if hasattr(self, 'process') and self.process is not None:
                 if self.process.state() == QProcess.Running:
                     try:
@@ -770,12 +1233,9 @@ class FileExplorer(QWidget):
         self.empty_view.setStyleSheet("background-color: #fafafa;")
         
         self.tree = CustomTreeView()
-        self.model = QFileSystemModel()
+        self.model = LazyFileModel(self)
         self.tree.setModel(self.model)
-        
-        self.tree.hideColumn(1) 
-        self.tree.hideColumn(2)  
-        self.tree.hideColumn(3)  
+        self.tree.setUniformRowHeights(True)
         self.tree.header().hide()  
 
         self.tree.setStyleSheet("""
@@ -894,7 +1354,6 @@ class FileExplorer(QWidget):
     def select_folder_programmatically(self, folder):
         self.current_folder = folder
         self.model.setRootPath(folder)
-        self.tree.setRootIndex(self.model.index(folder))
         self.update_folder_name(folder)
         
         self.stacked_widget.setCurrentWidget(self.tree)
@@ -906,6 +1365,9 @@ class FileExplorer(QWidget):
         if self.terminal_widget:
             self.terminal_widget.change_working_directory(folder)
 
+        if self.parent_ide:
+            self.parent_ide.open_project(folder)
+
     def show_context_menu(self, position):
         if not self.current_folder:
             return
@@ -993,6 +1455,17 @@ class PythonIDE(QMainWindow):
         self.setWindowTitle("C/C++ Code Editor")
         self.setWindowIcon(QIcon(get_icon_path())) 
         self.setGeometry(100, 100, 1200, 800)
+        self.project_config = None
+        self.workspace_folder = None
+        self.workspace_symbols = ()
+        self.workspace_indexer = None
+        self.workspace_indexers = []
+        self.diagnostics = []
+        self.check_syntax_while_typing = True
+        self.syntax_checker = SyntaxChecker(self)
+        self.syntax_checker.results_ready.connect(self.on_syntax_checked)
+        self.syntax_checker.start()
+        self.quick_open_index = QuickOpenIndex(self)
         self.init_ui()
         self.init_menu()
         self.init_shortcuts()  
@@ -1127,8 +1600,15 @@ class PythonIDE(QMainWindow):
         
         self.terminal = TerminalWidget(self)
         right_splitter.addWidget(self.terminal)
+
+        self.problems_panel = ProblemsPanel(self)
+        self.problems_panel.location_activated.connect(self.go_to_location)
+        self.problems_panel.hide()
+        self.terminal.diagnostics_ready.connect(self.show_diagnostics)
+        self.terminal.compile_progress.connect(self.show_compile_progress)
+        right_splitter.addWidget(self.problems_panel)
         
-        right_splitter.setSizes([600, 200])
+        right_splitter.setSizes([600, 200, 150])
         
         main_splitter.addWidget(right_splitter)
         main_splitter.setSizes([250, 950])
@@ -1152,6 +1632,11 @@ class PythonIDE(QMainWindow):
         open_action.setShortcut('Ctrl+O')
         open_action.triggered.connect(self.open_file)
         file_menu.addAction(open_action)
+
+        go_to_file_action = QAction('Go to File...', self)
+        go_to_file_action.setShortcut('Ctrl+P')
+        go_to_file_action.triggered.connect(self.show_quick_open)
+        file_menu.addAction(go_to_file_action)
         
         save_action = QAction('Save', self)
         save_action.setShortcut('Ctrl+S')
@@ -1183,19 +1668,245 @@ class PythonIDE(QMainWindow):
         run_action.setShortcut('Ctrl+R')
         run_action.triggered.connect(self.run_current_file)
         run_menu.addAction(run_action)
+
+        benchmark_action = QAction('Benchmark...', self)
+        benchmark_action.setShortcut('Ctrl+Alt+R')
+        benchmark_action.triggered.connect(self.benchmark_current_file)
+        run_menu.addAction(benchmark_action)
+
+        tests_action = QAction('Run Tests', self)
+        tests_action.setShortcut('Ctrl+Shift+T')
+        tests_action.triggered.connect(self.test_current_file)
+        run_menu.addAction(tests_action)
+
+        history_action = QAction('Show Run History', self)
+        history_action.triggered.connect(self.show_run_history)
+        run_menu.addAction(history_action)
+
+        pch_action = QAction('Use Precompiled Headers', self)
+        pch_action.setCheckable(True)
+        pch_action.setChecked(self.terminal.use_precompiled_headers)
+        pch_action.toggled.connect(lambda checked: setattr(self.terminal, 'use_precompiled_headers', checked))
+        run_menu.addAction(pch_action)
+
+        run_menu.addSeparator()
+
+        syntax_action = QAction('Check Syntax While Typing', self)
+        syntax_action.setCheckable(True)
+        syntax_action.setChecked(self.check_syntax_while_typing)
+        syntax_action.toggled.connect(lambda checked: setattr(self, 'check_syntax_while_typing', checked))
+        run_menu.addAction(syntax_action)
+
+        timeout_action = QAction('Compile Timeout...', self)
+        timeout_action.triggered.connect(self.set_compile_timeout)
+        run_menu.addAction(timeout_action)
+
+        scrollback_action = QAction('Terminal Scrollback Limit...', self)
+        scrollback_action.triggered.connect(self.set_scrollback_limit)
+        run_menu.addAction(scrollback_action)
+
+        spill_action = QAction('Save Full Output to Temp File', self)
+        spill_action.setCheckable(True)
+        spill_action.toggled.connect(self.terminal.set_spill_to_file)
+        run_menu.addAction(spill_action)
+
+        stdin_action = QAction('Attach Stdin File...', self)
+        stdin_action.triggered.connect(self.attach_stdin_file)
+        run_menu.addAction(stdin_action)
+
+        detach_stdin_action = QAction('Detach Stdin File', self)
+        detach_stdin_action.triggered.connect(lambda: self.attach_stdin_file(detach=True))
+        run_menu.addAction(detach_stdin_action)
+
+        replay_action = QAction('Replay Last Typed Input on Run', self)
+        replay_action.setCheckable(True)
+        replay_action.toggled.connect(lambda checked: setattr(self.terminal, 'replay_input', checked))
+        run_menu.addAction(replay_action)
+
+        capture_action = QAction('Capture Program Output to File', self)
+        capture_action.setCheckable(True)
+        capture_action.toggled.connect(lambda checked: setattr(self.terminal, 'capture_to_file', checked))
+        run_menu.addAction(capture_action)
+        self.terminal.output_captured.connect(self.open_output_viewer)
+
+        self.file_profile_menu = run_menu.addMenu('Build Profile (Current File)')
+        self.file_profile_menu.aboutToShow.connect(self.populate_file_profile_menu)
+        self.folder_profile_menu = run_menu.addMenu('Build Profile (Folder)')
+        self.folder_profile_menu.aboutToShow.connect(self.populate_folder_profile_menu)
+
+        run_menu.addSeparator()
+
+        build_project_action = QAction('Build Project', self)
+        build_project_action.setShortcut('Ctrl+Shift+B')
+        build_project_action.triggered.connect(lambda: self.build_project(run_after_build=False))
+        run_menu.addAction(build_project_action)
+
+        run_project_action = QAction('Build and Run Project', self)
+        run_project_action.setShortcut('Ctrl+Shift+R')
+        run_project_action.triggered.connect(lambda: self.build_project(run_after_build=True))
+        run_menu.addAction(run_project_action)
         
     def init_shortcuts(self):
         QShortcut(QKeySequence("Ctrl+W"), self, self.close_current_tab)
         QShortcut(QKeySequence("Ctrl+T"), self, self.create_new_tab)
         QShortcut(QKeySequence("Escape"), self, self.hide_find_replace)
         
+    def open_project(self, folder):
+        self.project_config = ProjectConfig(folder)
+        self.terminal.compile_timeout = float(self.project_config.data.get('compile_timeout', DEFAULT_COMPILE_TIMEOUT))
+        self.index_workspace(folder)
+        self.quick_open_index.set_folder(folder)
+
+    def available_profiles(self):
+        if self.project_config:
+            return self.project_config.profiles()
+        return dict(BUILTIN_PROFILES)
+
+    def profile_for(self, editor):
+        """Name of the build profile ``editor``'s file is compiled with."""
+        file_path = getattr(editor, 'file_path', None)
+        if self.project_config and file_path and self.project_config.contains(file_path):
+            return self.project_config.file_profile(file_path)
+        return getattr(editor, 'build_profile', DEFAULT_PROFILE)
+
+    def set_profile_for(self, editor, profile):
+        file_path = getattr(editor, 'file_path', None)
+        if self.project_config and file_path and self.project_config.contains(file_path):
+            self.project_config.set_file_profile(file_path, profile)
+        else:
+            editor.build_profile = profile or DEFAULT_PROFILE
+
+    def _fill_profile_menu(self, menu, current, on_selected):
+        menu.clear()
+        group = QActionGroup(menu)
+        for name, flags in self.available_profiles().items():
+            action = menu.addAction(f"{name}  {' '.join(flags)}".rstrip())
+            action.setCheckable(True)
+            action.setChecked(name == current)
+            action.triggered.connect(lambda _, name=name: on_selected(name))
+            group.addAction(action)
+
+    def populate_file_profile_menu(self):
+        editor = self.tab_content_widget.currentWidget()
+        if editor is None:
+            self.file_profile_menu.clear()
+            return
+        self._fill_profile_menu(self.file_profile_menu, self.profile_for(editor),
+                                lambda name: self.set_profile_for(editor, name))
+        file_path = getattr(editor, 'file_path', None)
+        if self.project_config and file_path and self.project_config.contains(file_path):
+            self.file_profile_menu.addSeparator()
+            self.file_profile_menu.addAction(
+                'Use Folder Profile', lambda: self.set_profile_for(editor, None))
+
+    def populate_folder_profile_menu(self):
+        if not self.project_config:
+            self.folder_profile_menu.clear()
+            self.folder_profile_menu.addAction('Open a folder first').setEnabled(False)
+            return
+        self._fill_profile_menu(self.folder_profile_menu, self.project_config.folder_profile(),
+                                self.project_config.set_folder_profile)
+
+    def profile_flags(self, profile):
+        return list(self.available_profiles().get(profile, []))
+
+    def index_workspace(self, folder, report=True):
+        """(Re)build the symbol index of ``folder`` in the background.
+
+        Only files whose mtime or size changed since the last run are parsed.
+        """
+        if self.workspace_indexer is not None:
+            self.workspace_indexer.requestInterruption()
+
+        self.workspace_folder = os.path.abspath(folder)
+        indexer = WorkspaceIndexer(folder)
+        indexer.symbols_ready.connect(self.on_workspace_indexed)
+        if report:
+            indexer.output_signal.connect(self.terminal.append_output)
+        indexer.finished.connect(lambda: self.workspace_indexers.remove(indexer))
+        self.workspace_indexers.append(indexer)
+        self.workspace_indexer = indexer
+        indexer.start()
+
+    def on_workspace_indexed(self, root, symbols):
+        if self.sender() is not self.workspace_indexer:
+            return
+        self.workspace_symbols = symbols
+        for i in range(self.tab_content_widget.count()):
+            editor = self.tab_content_widget.widget(i)
+            if isinstance(editor, CodeEditor):
+                editor.set_workspace_symbols(symbols)
+
     def is_untitled_empty(self, editor):
-        return (not hasattr(editor, 'file_path') or editor.file_path is None) and \
+        return isinstance(editor, CodeEditor) and \
+               (not hasattr(editor, 'file_path') or editor.file_path is None) and \
                editor.toPlainText().strip() == ""
+
+    def show_compile_progress(self, name, elapsed):
+        if elapsed < 0:
+            self.statusBar().clearMessage()
+        else:
+            self.statusBar().showMessage(f"Compiling {name}... {elapsed:.0f}s "
+                                         f"(timeout {self.terminal.compile_timeout:g}s)")
+
+    def show_diagnostics(self, diagnostics):
+        self.diagnostics = diagnostics
+        self.problems_panel.set_diagnostics(diagnostics)
+        self.problems_panel.setVisible(bool(diagnostics))
+        for i in range(self.tab_content_widget.count()):
+            editor = self.tab_content_widget.widget(i)
+            if isinstance(editor, CodeEditor):
+                self.apply_diagnostics(editor)
+
+    def apply_diagnostics(self, editor):
+        if editor.file_path:
+            editor.set_diagnostics([d for d in self.diagnostics if same_file(d.file, editor.file_path)])
+
+    def check_syntax(self, editor):
+        """Check the unsaved text of ``editor`` with -fsyntax-only in the background."""
+        if not self.check_syntax_while_typing or editor is not self.tab_content_widget.currentWidget():
+            return
+        file_path = editor.file_path
+        extension = os.path.splitext(file_path)[1].lower() if file_path else '.cpp'
+        if extension not in SOURCE_EXTENSIONS:
+            return
+        profile = self.profile_for(editor)
+        self.syntax_checker.check(editor, editor.toPlainText(), file_path, 'gcc' if extension == '.c' else 'g++',
+                                  self.profile_flags(profile), self.terminal.use_precompiled_headers)
+
+    def on_syntax_checked(self, editor, diagnostics):
+        if sip.isdeleted(editor) or self.tab_content_widget.indexOf(editor) == -1:
+            return  # closed while it was being checked
+        source = editor.file_path or UNSAVED_NAME
+        editor.set_diagnostics([d for d in diagnostics
+                                if d.file == source or (editor.file_path and same_file(d.file, source))])
+
+    def go_to_location(self, file_path, line, column):
+        if not os.path.exists(file_path):
+            self.terminal.append_output(f"Cannot open {file_path}\n")
+            return
+        # The compiler may spell the path differently from the open tab
+        for open_path in self.open_files:
+            if same_file(open_path, file_path):
+                file_path = open_path
+                break
+        self.open_file_by_path(file_path)
+        editor = self.tab_content_widget.currentWidget()
+        if isinstance(editor, CodeEditor):
+            editor.go_to_line(line, column)
+
+    def open_output_viewer(self, path):
+        viewer = OutputViewer(path)
+        tab_index = self.tab_bar.addTab(f"Output: {os.path.basename(path)}")
+        content_index = self.tab_content_widget.addWidget(viewer)
+        self.tab_bar.setCurrentIndex(tab_index)
+        self.tab_content_widget.setCurrentIndex(content_index)
         
     def create_new_tab(self, file_path=None, content=""):
         editor = CodeEditor()
         editor.setPlainText(content)
+        if self.workspace_symbols:
+            editor.set_workspace_symbols(self.workspace_symbols)
         
         if file_path:
             tab_name = os.path.basename(file_path)
@@ -1213,6 +1924,7 @@ class PythonIDE(QMainWindow):
         editor.setFocus()
         
         editor.textChanged.connect(lambda: self.mark_tab_modified(editor))
+        editor.typing_idle.connect(lambda: self.check_syntax(editor))
         
         return editor
         
@@ -1244,6 +1956,16 @@ class PythonIDE(QMainWindow):
         if file_path:
             self.open_file_by_path(file_path)
             
+    def show_quick_open(self):
+        if self.quick_open_index.root is None:
+            self.statusBar().showMessage("Open a folder to use Go to File", 3000)
+            return
+        self.quick_open_index.refresh_unwatched()
+        dialog = QuickOpenDialog(self.quick_open_index, self)
+        if dialog.exec_() != QuickOpenDialog.Accepted or not dialog.selected_path():
+            return
+        self.open_file_by_path(dialog.selected_path())
+
     def open_file_by_path(self, file_path):
         if file_path in self.open_files:
             tab_index = self.open_files[file_path]
@@ -1267,11 +1989,13 @@ class PythonIDE(QMainWindow):
                         
                         self.open_files[file_path] = current_index
                         self.remove_modified_indicator(current_editor)
+                        self.apply_diagnostics(current_editor)
                         current_editor.setFocus()
                         return
                 
                 editor = self.create_new_tab(file_path, content)
                 self.remove_modified_indicator(editor)
+                self.apply_diagnostics(editor)
                     
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not open file: {str(e)}")
@@ -1280,7 +2004,7 @@ class PythonIDE(QMainWindow):
         current_index = self.tab_content_widget.currentIndex()
         if current_index >= 0:
             current_editor = self.tab_content_widget.widget(current_index)
-            if current_editor:
+            if isinstance(current_editor, CodeEditor):
                 if hasattr(current_editor, 'file_path') and current_editor.file_path:
                     self.save_file_to_path(current_editor, current_editor.file_path)
                 else:
@@ -1290,7 +2014,7 @@ class PythonIDE(QMainWindow):
         current_index = self.tab_content_widget.currentIndex()
         if current_index >= 0:
             current_editor = self.tab_content_widget.widget(current_index)
-            if current_editor:
+            if isinstance(current_editor, CodeEditor):
                 file_path, _ = QFileDialog.getSaveFileName(
                     self,
                     "Save File",
@@ -1317,6 +2041,10 @@ class PythonIDE(QMainWindow):
                 self.open_files[file_path] = content_index
                 
                 self.remove_modified_indicator(editor)
+
+            if self.workspace_folder and os.path.abspath(file_path).startswith(
+                    os.path.join(self.workspace_folder, '')):
+                self.index_workspace(self.workspace_folder, report=False)
             
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not save file: {str(e)}")
@@ -1349,6 +2077,8 @@ class PythonIDE(QMainWindow):
                 self.open_files[file_path] = index - 1
         self.tab_bar.removeTab(tab_index)
         self.tab_content_widget.removeWidget(editor)
+        if isinstance(editor, OutputViewer):
+            editor.close_file()
         editor.deleteLater()
         
         if self.tab_bar.count() == 0:
@@ -1363,7 +2093,7 @@ class PythonIDE(QMainWindow):
         current_index = self.tab_content_widget.currentIndex()
         if current_index >= 0:
             current_editor = self.tab_content_widget.widget(current_index)
-            if current_editor:
+            if isinstance(current_editor, CodeEditor):
                 self.find_replace_widget.show_for_editor(current_editor)
             
     def hide_find_replace(self):
@@ -1376,15 +2106,147 @@ class PythonIDE(QMainWindow):
             if current_editor:
                 file_path = getattr(current_editor, 'file_path', None)
                 if file_path and os.path.exists(file_path):
-                    self.terminal.run_cpp_code(file_path)
+                    profile = self.profile_for(current_editor)
+                    self.terminal.run_cpp_code(file_path, profile, self.profile_flags(profile))
                 else:
                     self.append_output("Please save the file before running.\n")
     
+    def benchmark_current_file(self):
+        editor = self.tab_content_widget.currentWidget()
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path or not os.path.exists(file_path):
+            self.terminal.append_output("Please save the file before benchmarking.\n")
+            return
+
+        profile = self.profile_for(editor)
+        dialog = BenchmarkDialog(list(self.available_profiles()), profile, self)
+        if dialog.exec_() != BenchmarkDialog.Accepted:
+            return
+        profile = dialog.profile.currentText()
+        comparison = dialog.comparison()
+        builds = [(profile, file_path, profile, self.profile_flags(profile))]
+
+        if comparison:
+            kind, value = comparison
+            if kind == 'profile':
+                if value == profile:
+                    self.terminal.append_output("Pick a different profile to compare with.\n")
+                    return
+                builds.append((value, file_path, value, self.profile_flags(value)))
+            else:
+                if kind == 'head':
+                    value = self.checkout_head_revision(file_path)
+                    if value is None:
+                        return
+                # Quoted includes of the other revision resolve next to the current file
+                flags = self.profile_flags(profile) + ['-I', os.path.dirname(file_path)]
+                builds[0] = ('current', file_path, profile, self.profile_flags(profile))
+                builds.append(('HEAD' if kind == 'head' else 'other', value, profile, flags))
+
+        temp_dir = os.path.dirname(builds[1][1]) if comparison and comparison[0] == 'head' else None
+        self.terminal.run_benchmark(builds, dialog.runs.value(), dialog.warmup.value(),
+                                    dialog.stdin_path.text().strip() or None, temp_dir)
+
+    def test_current_file(self):
+        """Run the current file against every .in/.out pair of the open folder.
+
+        Limits come from "time_limit" (seconds) and "memory_limit_mb" in the
+        project config.
+        """
+        editor = self.tab_content_widget.currentWidget()
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path or not os.path.exists(file_path):
+            self.terminal.append_output("Please save the file before running tests.\n")
+            return
+
+        folder = self.file_explorer.current_folder or os.path.dirname(file_path)
+        cases = discover_cases(folder)
+        if not cases:
+            self.terminal.append_output(f"No .in/.out test pairs found in {folder}.\n")
+            return
+
+        config = self.project_config.data if self.project_config else {}
+        profile = self.profile_for(editor)
+        self.terminal.run_tests(file_path, profile, self.profile_flags(profile), cases,
+                                float(config.get('time_limit', DEFAULT_TIME_LIMIT)),
+                                int(config.get('memory_limit_mb', DEFAULT_MEMORY_LIMIT_MB)))
+
+    def checkout_head_revision(self, file_path):
+        """Write the committed version of ``file_path`` to a new temp dir and return its path.
+
+        The caller removes the directory when done with it."""
+        folder, name = os.path.split(file_path)
+        try:
+            result = subprocess.run(['git', 'show', f'HEAD:./{name}'], cwd=folder,
+                                    capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError) as e:
+            self.terminal.append_output(f"Could not run git: {e}\n")
+            return None
+        if result.returncode != 0:
+            self.terminal.append_output(f"No committed revision of {name}: {result.stderr.decode(errors='replace')}\n")
+            return None
+        head_path = os.path.join(tempfile.mkdtemp(prefix='cpp_editor_head_'), name)
+        with open(head_path, 'wb') as f:
+            f.write(result.stdout)
+        return head_path
+
+    def set_compile_timeout(self):
+        seconds, ok = QInputDialog.getInt(self, "Compile Timeout", "Seconds before a compile is stopped:",
+                                          int(self.terminal.compile_timeout), 1, 24 * 3600, 10)
+        if ok:
+            self.terminal.compile_timeout = seconds
+            if self.project_config:
+                self.project_config.data['compile_timeout'] = seconds
+                self.project_config.save()
+
+    def set_scrollback_limit(self):
+        lines, ok = QInputDialog.getInt(self, "Scrollback Limit", "Lines kept in the terminal:",
+                                        self.terminal.scrollback_lines, 100, 10000000, 1000)
+        if ok:
+            self.terminal.set_scrollback_lines(lines)
+
+    def attach_stdin_file(self, detach=False):
+        editor = self.tab_content_widget.currentWidget()
+        file_path = getattr(editor, 'file_path', None)
+        if not file_path:
+            self.terminal.append_output("Error: Please save the file first.\n")
+            return
+        if detach:
+            self.terminal.set_stdin_file(file_path, None)
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "Stdin File", os.path.dirname(file_path),
+                                              "Input Files (*.in *.txt);;All Files (*)")
+        if path:
+            self.terminal.set_stdin_file(file_path, path)
+
+    def show_run_history(self):
+        editor = self.tab_content_widget.currentWidget()
+        file_path = getattr(editor, 'file_path', None)
+        if file_path:
+            self.terminal.show_run_history(file_path)
+
+    def build_project(self, run_after_build=True):
+        folder = self.file_explorer.current_folder
+        if not folder:
+            self.terminal.append_output("Open a folder to build it as a project.\n")
+            return
+        profile = self.project_config.folder_profile() if self.project_config else DEFAULT_PROFILE
+        self.terminal.run_project(folder, run_after_build, profile, self.profile_flags(profile))
+
     def closeEvent(self, event):
+        for indexer in list(self.workspace_indexers):
+            indexer.requestInterruption()
+            indexer.wait()
+        self.syntax_checker.stop()
+        self.quick_open_index.stop()
+        if self.terminal.spill_file is not None:
+            self.terminal.spill_file.close()
+
         try:
             if hasattr(self, 'terminal') and self.terminal:
                 if hasattr(self.terminal, 'stop_process') and callable(self.terminal.stop_process):
                     self.terminal.stop_process()
+                self.terminal.finish_stopped_processes()
 
                 QApplication.processEvents()
 
@@ -0,0 +1,162 @@
+import mmap
+import os
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPainter, QColor, QFont, QFontMetrics
+from PyQt5.QtWidgets import QAbstractScrollArea
+
+
+def head_and_tail(path, lines=20):
+    """Return the first and last ``lines`` lines of a file without reading all of it."""
+    with open(path, 'rb') as f:
+        head = []
+        for _ in range(lines):
+            line = f.readline()
+            if not line:
+                break
+            head.append(line)
+        head_end = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        # The tail never overlaps the head; a block cut mid-line loses its first line
+        start = max(head_end, size - 64 * 1024)
+        f.seek(start)
+        tail = f.read().splitlines(keepends=True)
+        if start > head_end and tail:
+            tail = tail[1:]
+    return (b''.join(head).decode('utf-8', 'replace'),
+            b''.join(tail[-lines:]).decode('utf-8', 'replace'))
+
+
+class OutputViewer(QAbstractScrollArea):
+    """Read-only view of a file of any size, memory-mapped and drawn a screen at a time.
+
+    The scroll bar works in bytes rather than lines, so no line index has to
+    be built; a position is snapped back to the start of its line.
+    """
+    MAX_LINE_CHARS = 2000
+    REFRESH_MS = 500
+    # QScrollBar values are ints, so large files scroll in steps of this many bytes
+    SCROLL_UNIT_LIMIT = 2 ** 30
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.file_path = None  # not an editable document
+        self.setFont(QFont("Consolas", 11))
+        self.viewport().setStyleSheet("background-color: #1e1e1e;")
+        self._file = open(path, 'rb')
+        self._map = None
+        self._size = 0
+        self._top = 0
+        self.verticalScrollBar().valueChanged.connect(self._on_scroll)
+
+        # The program may still be writing; pick up growth periodically
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self._refresh_timer.start()
+        self.refresh()
+
+    def refresh(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size == self._size:
+            return
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._size = size
+        self._update_scroll_range()
+        self.viewport().update()
+
+    def close_file(self):
+        self._refresh_timer.stop()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def _scale(self):
+        return max(1, self._size // self.SCROLL_UNIT_LIMIT + 1)
+
+    def _update_scroll_range(self):
+        bar = self.verticalScrollBar()
+        bar.blockSignals(True)
+        bar.setRange(0, self._size // self._scale())
+        bar.setPageStep(max(1, self._visible_line_count() * 80 // self._scale()))
+        bar.setSingleStep(max(1, 80 // self._scale()))
+        bar.setValue(self._top // self._scale())
+        bar.blockSignals(False)
+
+    def _visible_line_count(self):
+        return max(1, self.viewport().height() // QFontMetrics(self.font()).lineSpacing())
+
+    def _line_start(self, offset):
+        if self._map is None or offset <= 0:
+            return 0
+        return self._map.rfind(b'\n', 0, min(offset, self._size)) + 1
+
+    def _next_line(self, offset):
+        end = self._map.find(b'\n', offset)
+        return self._size if end == -1 else end + 1
+
+    def _on_scroll(self, value):
+        self._top = self._line_start(value * self._scale())
+        self.viewport().update()
+
+    def scroll_lines(self, count):
+        if self._map is None:
+            return
+        for _ in range(abs(count)):
+            if count > 0:
+                following = self._next_line(self._top)
+                if following >= self._size:
+                    break
+                self._top = following
+            else:
+                if self._top == 0:
+                    break
+                self._top = self._line_start(self._top - 1)
+        bar = self.verticalScrollBar()
+        bar.blockSignals(True)
+        bar.setValue(self._top // self._scale())
+        bar.blockSignals(False)
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        self.scroll_lines(-event.angleDelta().y() // 40)
+
+    def keyPressEvent(self, event):
+        page = self._visible_line_count() - 1
+        moves = {Qt.Key_Down: 1, Qt.Key_Up: -1, Qt.Key_PageDown: page, Qt.Key_PageUp: -page}
+        if event.key() in moves:
+            self.scroll_lines(moves[event.key()])
+        elif event.key() == Qt.Key_Home:
+            self.verticalScrollBar().setValue(0)
+        elif event.key() == Qt.Key_End:
+            self._top = self._line_start(self._size - 1)
+            self.scroll_lines(-page)
+        else:
+            super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scroll_range()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        painter.setPen(QColor("#d4d4d4"))
+        metrics = QFontMetrics(self.font())
+        if self._map is None:
+            painter.drawText(4, metrics.ascent() + 2, "(no output yet)")
+            return
+        y = metrics.ascent() + 2
+        offset = self._top
+        for _ in range(self._visible_line_count() + 1):
+            if offset >= self._size:
+                break
+            end = self._next_line(offset)
+            line = self._map[offset:min(end, offset + self.MAX_LINE_CHARS * 4)]
+            painter.drawText(4, y, line.rstrip(b'\r\n').decode('utf-8', 'replace')[:self.MAX_LINE_CHARS])
+            y += metrics.lineSpacing()
+            offset = end
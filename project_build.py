@@ -0,0 +1,202 @@
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from command_stream import stream_command, DEFAULT_COMPILE_TIMEOUT
+from diagnostics import parse_diagnostics
+from workspace_index import iter_source_files
+
+
+TRANSLATION_UNIT_EXTENSIONS = ('.c', '.cpp', '.cc', '.cxx')
+BUILD_DIR = 'build'
+
+
+def parse_depfile(path):
+    """Return the prerequisites listed in a make-style ``-MMD`` depfile."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    except OSError:
+        return None
+    text = text.replace('\\\n', ' ')
+    # The rule's colon is followed by whitespace, unlike a drive letter's in C:/...
+    parts = re.split(r':(?=\s|$)', text, 1)
+    prerequisites = parts[1] if len(parts) == 2 else ''
+    # Only the first rule matters; -MMD may add empty ones for each header
+    prerequisites = prerequisites.split('\n', 1)[0]
+    deps = []
+    for word in prerequisites.replace('\\ ', '\0').split():
+        deps.append(word.replace('\0', ' '))
+    return deps
+
+
+class ProjectBuilder(QThread):
+    """Build every translation unit of a folder into one executable.
+
+    Objects go to ``build/<profile>/obj`` next to ``-MMD`` depfiles. An object is only
+    recompiled when its source, one of the headers it depends on, or its
+    command line changed, and the link step is skipped when no object did.
+    """
+    output_signal = pyqtSignal(str)
+    process_created = pyqtSignal(str)
+    diagnostics_ready = pyqtSignal(object)
+
+    def __init__(self, root, run_after_build=True, jobs=None, profile='default', flags=(),
+                 compile_timeout=DEFAULT_COMPILE_TIMEOUT):
+        super().__init__()
+        self.compile_timeout = compile_timeout
+        self.root = os.path.abspath(root)
+        self.run_after_build = run_after_build
+        self.jobs = jobs or os.cpu_count() or 1
+        self.profile = profile
+        self.flags = list(flags)
+        # One tree per profile, so switching profiles does not rebuild everything
+        self.build_dir = os.path.join(self.root, BUILD_DIR, profile)
+        self.object_dir = os.path.join(self.build_dir, 'obj')
+        name = os.path.basename(self.root) or 'project'
+        self.output_exe = os.path.join(self.build_dir, name + '.exe')
+
+    def run(self):
+        start = time.perf_counter()
+        sources = sorted(path for path, _, _ in iter_source_files(self.root, TRANSLATION_UNIT_EXTENSIONS))
+        if not sources:
+            self.output_signal.emit("Error: No .c or .cpp files found in the project folder.\n")
+            return
+
+        self.output_signal.emit(
+            f"--- Building {os.path.basename(self.root)} ({len(sources)} files, {self.profile} profile) ---\n")
+        units = [self.translation_unit(source) for source in sources]
+        stale = [unit for unit in units if self.is_stale(unit)]
+        if stale:
+            if not self.compile_all(stale, len(units)):
+                return
+        else:
+            self.output_signal.emit("All objects are up to date.\n")
+
+        objects = [unit['object'] for unit in units]
+        if self.needs_link(objects, relink=bool(stale)):
+            if not self.link(units):
+                return
+        else:
+            self.output_signal.emit("Executable is up to date, skipping link.\n")
+
+        elapsed = time.perf_counter() - start
+        self.output_signal.emit(
+            f"--- Build Successful: {len(stale)} of {len(units)} files compiled in {elapsed:.2f}s ---\n\n")
+        if self.run_after_build:
+            self.process_created.emit(self.output_exe)
+
+    def translation_unit(self, source):
+        relative = os.path.relpath(source, self.root)
+        base = os.path.join(self.object_dir, relative)
+        compiler = 'gcc' if source.endswith('.c') else 'g++'
+        obj = base + '.o'
+        return {
+            'source': source,
+            'relative': relative,
+            'object': obj,
+            'depfile': base + '.d',
+            'cmdfile': base + '.cmd',
+            'command': [compiler] + self.flags + ['-c', source, '-o', obj, '-MMD', '-MP', '-MF', base + '.d'],
+        }
+
+    def is_stale(self, unit):
+        try:
+            object_mtime = os.stat(unit['object']).st_mtime_ns
+            with open(unit['cmdfile'], 'r', encoding='utf-8') as f:
+                if f.read() != '\0'.join(unit['command']):
+                    return True
+        except OSError:
+            return True
+
+        deps = parse_depfile(unit['depfile'])
+        if deps is None:
+            return True
+        for dep in deps or [unit['source']]:
+            try:
+                if os.stat(os.path.join(self.root, dep)).st_mtime_ns > object_mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def compile_unit(self, unit):
+        os.makedirs(os.path.dirname(unit['object']), exist_ok=True)
+        # Units run in parallel, so each one's output is collected and shown whole
+        output = []
+        try:
+            returncode = stream_command(unit['command'], output.append, self.compile_timeout,
+                                        self.isInterruptionRequested, cwd=self.root)
+        except subprocess.TimeoutExpired:
+            return False, f"Error: Compilation timed out after {self.compile_timeout:g}s.\n"
+        except Exception as e:
+            return False, f"Error during compilation: {e}\n"
+        if returncode == 0:
+            with open(unit['cmdfile'], 'w', encoding='utf-8') as f:
+                f.write('\0'.join(unit['command']))
+        return returncode == 0, ''.join(output)
+
+    def compile_all(self, stale, total):
+        self.output_signal.emit(
+            f"Compiling {len(stale)} of {total} files on {min(self.jobs, len(stale))} workers\n")
+        failed = 0
+        diagnostics = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self.compile_unit, unit) for unit in stale]
+            for count, (unit, future) in enumerate(zip(stale, futures), 1):
+                if self.isInterruptionRequested():
+                    for pending in futures:
+                        pending.cancel()
+                    return False
+                ok, output = future.result()
+                self.output_signal.emit(f"[{count}/{len(stale)}] {unit['relative']}\n")
+                if output:
+                    self.output_signal.emit(output)
+                    diagnostics.extend(parse_diagnostics(output, self.root))
+                if not ok:
+                    failed += 1
+        self.diagnostics_ready.emit(diagnostics)
+        if failed:
+            self.output_signal.emit(f"--- Compilation Failed: {failed} of {len(stale)} files had errors ---\n")
+            return False
+        return True
+
+    def needs_link(self, objects, relink):
+        if relink:
+            return True
+        try:
+            exe_mtime = os.stat(self.output_exe).st_mtime_ns
+            with open(self.output_exe + '.objects', 'r', encoding='utf-8') as f:
+                if f.read() != '\0'.join(objects):
+                    return True
+            return any(os.stat(obj).st_mtime_ns > exe_mtime for obj in objects)
+        except OSError:
+            return True
+
+    def link(self, units):
+        objects = [unit['object'] for unit in units]
+        linker = 'g++' if any(unit['command'][0] == 'g++' for unit in units) else 'gcc'
+        link_cmd = [linker] + self.flags + objects + ['-o', self.output_exe]
+        self.output_signal.emit(f"Linking {os.path.relpath(self.output_exe, self.root)}\n")
+        try:
+            returncode = stream_command(link_cmd, self.output_signal.emit, self.compile_timeout,
+                                        self.isInterruptionRequested, cwd=self.root)
+        except subprocess.TimeoutExpired:
+            self.output_signal.emit(f"Error: Linking timed out after {self.compile_timeout:g}s.\n")
+            return False
+        except Exception as e:
+            self.output_signal.emit(f"Error during linking: {e}\n")
+            return False
+        if returncode is None:
+            self.output_signal.emit("--- Linking cancelled ---\n")
+            return False
+        if returncode != 0:
+            self.output_signal.emit("--- Linking Failed ---\n")
+            return False
+        with open(self.output_exe + '.objects', 'w', encoding='utf-8') as f:
+            f.write('\0'.join(objects))
+        return True
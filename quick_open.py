@@ -0,0 +1,471 @@
+import bisect
+import os
+import time
+from array import array
+from itertools import accumulate
+
+from PyQt5.QtCore import (
+    Qt, QEvent, QThread, QObject, QTimer, QFileSystemWatcher, QAbstractListModel, QModelIndex, pyqtSignal
+)
+from PyQt5.QtWidgets import QApplication, QDialog, QVBoxLayout, QLineEdit, QListView, QLabel
+
+from file_tree import IgnoreRules, DirectoryScanner
+
+
+# Maps every non-zero byte to 1, so bytes.find can look for "any set bit"
+_NONZERO = bytes([0] + [1] * 255)
+# _set_bits converts pieces of up to this many bits to bytes instead of halving them
+_BITS_LEAF = 1 << 15
+# Masks are built a piece of text at a time, letting the GUI thread have the GIL in between
+_MASK_PIECE = 1 << 20
+
+
+def _byte_masks(text):
+    """One int per byte value of ``text``; its bit i is set where ``text[i]`` is that byte."""
+    values = set()
+    for start in range(0, len(text), _MASK_PIECE):
+        values.update(text[start:start + _MASK_PIECE])
+    masks = {}
+    for value in values:
+        table = bytes(49 if byte == value else 48 for byte in range(256))
+        mask = 0
+        for start in range(0, len(text), _MASK_PIECE):
+            # int() reads the most significant digit first, so each piece is
+            # reversed to put its first byte in the lowest bit
+            mask |= int(text[start:start + _MASK_PIECE][::-1].translate(table), 2) << start
+            time.sleep(0)
+        masks[value] = mask
+    return masks
+
+
+def _set_bits(value, offset=0):
+    """Positions of the set bits of ``value``, plus ``offset``, lowest first."""
+    size = value.bit_length()
+    if size > _BITS_LEAF:
+        # Halve until the pieces are small; zero halves are skipped whole, so
+        # a few matches in a long text cost a few passes rather than a scan
+        half = size // 2
+        low = value & ((1 << half) - 1)
+        if low:
+            yield from _set_bits(low, offset)
+        yield from _set_bits(value >> half, offset + half)
+        return
+    data = value.to_bytes((size + 7) // 8, 'little')
+    flags = data.translate(_NONZERO)
+    i = flags.find(1)
+    while i != -1:
+        byte = data[i]
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield offset + i * 8 + bit
+        i = flags.find(1, i + 1)
+
+
+class _Column:
+    """Strings joined one per line, with a bitmask per byte value over the text.
+
+    A match state is an int with a bit on the position of the last matched
+    byte, for every line at once.
+    """
+
+    def __init__(self, strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        # The leading newline lets every line, the first included, be anchored the same way
+        text = b'\n' + b'\n'.join(encoded) + b'\n'
+        self.size = len(text)
+        self.masks = _byte_masks(text)
+        self.newlines = self.masks.pop(10)
+        self.inside = ((1 << self.size) - 1) ^ self.newlines
+        self.line_ends = array('q', accumulate(len(line) + 1 for line in encoded))
+
+    def extend(self, state, data):
+        """``data`` directly after a match."""
+        for byte in data:
+            if not state:
+                break
+            state = (state << 1) & self.masks.get(byte, 0)
+        return state
+
+    def follow(self, state, data, repeated):
+        """``data`` anywhere after a match on the same line.
+
+        ``repeated`` says whether ``data`` starts with the byte ``state`` matched.
+        """
+        if not state:
+            return 0
+        # Adding a state bit into a run of ``inside`` bits carries up to the
+        # end of the line, so this sets every position from the first match
+        # on, minus later matches on the same line. Those are only wanted
+        # back when the byte repeats; otherwise the mask drops them anyway.
+        after = (self.inside + state) ^ self.inside
+        if repeated:
+            after ^= state
+        return self.extend(after & self.masks.get(data[0], 0), data[1:])
+
+    def anywhere(self, data):
+        return self.extend(self.masks.get(data[0], 0), data[1:])
+
+    def at_start(self, data):
+        return self.extend(self.newlines, data)
+
+    def matching_lines(self, state):
+        """Numbers of the lines with a match in ``state``, first line first."""
+        if not state:
+            return
+        # Same carry as in follow(): one bit on the newline ending each matching line
+        hits = ((self.inside + state) ^ self.inside) & self.newlines
+        for position in _set_bits(hits):
+            yield bisect.bisect_left(self.line_ends, position)
+
+
+class PathIndex:
+    """Relative paths of a folder, searchable with a fuzzy query.
+
+    A path matches when the query's characters appear in it in order.
+    Results are ranked by how they match: file name starting with the
+    query, file name containing it, file name matching it fuzzily, then
+    the whole path matching it fuzzily. Within a rank shorter names come
+    first.
+
+    Matching works on every path at once: the paths are joined into one
+    text, each byte value has a bitmask over it, and a query character is
+    one round of big-int arithmetic. The states for every prefix of the
+    last query are kept, so typing or deleting a character costs at most
+    one round however many paths match.
+    """
+
+    def __init__(self, paths):
+        # Bucketed first: one sort of every key would hold the GIL for a long stretch
+        buckets = {}
+        for path in paths:
+            buckets.setdefault((len(os.path.basename(path)), len(path)), []).append(path)
+        self.paths = [path for key in sorted(buckets) for path in sorted(buckets[key], key=str.lower)]
+        self._names = _Column([os.path.basename(p).lower() for p in self.paths])
+        self._full = _Column([p.lower() for p in self.paths])
+        self._query = ''
+        self._states = []  # state after each character of self._query
+
+    def __len__(self):
+        return len(self.paths)
+
+    def search(self, query, limit=50):
+        key = ''.join(query.lower().split()).replace('\\', '/')
+        if not key:
+            return self.paths[:limit]
+        results, seen = [], set()
+        columns = (self._names, self._names, self._names, self._full)
+        for column, state in zip(columns, self._state(key)):
+            for line in column.matching_lines(state):
+                if len(results) == limit:
+                    return results
+                if line not in seen:
+                    seen.add(line)
+                    results.append(self.paths[line])
+        return results
+
+    def forget_queries(self):
+        """Drop the kept match states; they take about as much memory as the index."""
+        self._query = ''
+        self._states = []
+
+    def _state(self, key):
+        common = 0
+        for old, new in zip(self._query, key):
+            if old != new:
+                break
+            common += 1
+        del self._states[common:]
+        for i in range(common, len(key)):
+            self._states.append(self._advance(self._states[-1] if i else None, key[i].encode('utf-8'),
+                                              key[i - 1].encode('utf-8')[-1] if i else None))
+        self._query = key
+        return self._states[-1]
+
+    def _advance(self, state, data, previous):
+        names, full = self._names, self._full
+        if state is None:
+            in_name = names.anywhere(data)
+            return names.at_start(data), in_name, in_name, full.anywhere(data)
+        prefix, substring, in_name, in_path = state
+        repeated = data[0] == previous
+        return (names.extend(prefix, data), names.extend(substring, data),
+                names.follow(in_name, data, repeated), full.follow(in_path, data, repeated))
+
+
+class PathIndexer(QThread):
+    """Lists the files of a folder and builds a PathIndex of them.
+
+    With ``previous`` listings and a set of ``changed`` directories only
+    those directories (and any new subdirectories) are listed again, and
+    ``index`` is handed back as it is when none of them really changed.
+    """
+    index_ready = pyqtSignal(object, object)  # PathIndex, {relative dir: (subdirectories, files)}
+
+    def __init__(self, root, rules, previous=None, changed=None, index=None):
+        super().__init__()
+        self.root = root
+        self.rules = rules
+        self.scanner = DirectoryScanner(rules)
+        self.directories = dict(previous or {})
+        self.changed = set(changed) if changed is not None else {''}
+        self.index = index
+
+    def run(self):
+        pending = sorted(self.changed)
+        modified = self.index is None
+        while pending:
+            if self.isInterruptionRequested():
+                return
+            relative = pending.pop()
+            old = self.directories.pop(relative, None)
+            listing = self.scan(relative)
+            modified = modified or listing != old
+            if listing is None:
+                self._forget_below(relative)
+                continue
+            self.directories[relative] = listing
+            prefix = relative + '/' if relative else ''
+            subdirectories = {prefix + name for name in listing[0]}
+            if old is not None:
+                for name in old[0]:
+                    if prefix + name not in subdirectories:
+                        self.directories.pop(prefix + name, None)
+                        self._forget_below(prefix + name)
+            pending.extend(path for path in subdirectories
+                           if path not in self.directories and not self._leads_back(path))
+
+        index = self.index
+        if modified:
+            paths = [(directory + '/' if directory else '') + name
+                     for directory, (_, files) in self.directories.items() for name in files]
+            index = PathIndex(paths)
+        if not self.isInterruptionRequested():
+            self.index_ready.emit(index, self.directories)
+
+    def scan(self, relative):
+        listing = self.scanner.scan(relative)
+        if listing is None:
+            return None
+        directories, files = listing
+        # A newline would split the file's line in the index
+        return directories, [name for name in files if '\n' not in name]
+
+    def _leads_back(self, relative):
+        """Whether ``relative`` is a link to itself or a directory above it, which would recurse forever."""
+        path = os.path.join(self.root, relative)
+        if not os.path.islink(path):
+            return False
+        target = os.path.realpath(path)
+        parts = relative.split('/')
+        return any(os.path.realpath(os.path.join(self.root, *parts[:depth])) == target
+                   for depth in range(len(parts)))
+
+    def _forget_below(self, relative):
+        prefix = relative + '/' if relative else ''
+        for path in [path for path in self.directories if path.startswith(prefix)]:
+            del self.directories[path]
+
+
+class QuickOpenIndex(QObject):
+    """The PathIndex of the open folder, kept current while the folder changes.
+
+    Every listed directory is watched. Changed directories are collected for
+    a moment and then listed again on a worker thread, which builds a new
+    index; searches use the old one until it is ready.
+    """
+    updated = pyqtSignal()
+    RESCAN_DELAY_MS = 300
+    # Directories given to the watcher per event loop turn; a big tree has thousands
+    WATCH_BATCH = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.index = None
+        self.rules = None
+        self.directories = {}
+        self.indexer = None
+        self.indexers = []
+        self.unwatched = set()
+        self._changed = set()
+        self._to_watch = []
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(self.RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self._rescan)
+
+    def set_folder(self, folder):
+        self.root = os.path.abspath(folder)
+        self.rules = IgnoreRules(self.root)
+        self.index = None
+        self.directories = {}
+        self.unwatched = set()
+        self._changed = set()
+        self._to_watch = []
+        if self._watcher.directories():
+            self._watcher.removePaths(self._watcher.directories())
+        self._start(None)
+
+    def search(self, query, limit=50):
+        if self.index is None:
+            return []
+        return [os.path.join(self.root, *path.split('/')) for path in self.index.search(query, limit)]
+
+    def is_ready(self):
+        return self.index is not None
+
+    def refresh_unwatched(self):
+        """List the directories the watcher could not take again; they have no other way to update."""
+        if self.unwatched:
+            self._changed |= self.unwatched
+            self._rescan_timer.start()
+
+    def stop(self):
+        self._rescan_timer.stop()
+        for indexer in list(self.indexers):
+            indexer.requestInterruption()
+            indexer.wait()
+
+    def _start(self, changed):
+        if self.indexer is not None:
+            self.indexer.requestInterruption()
+        indexer = PathIndexer(self.root, self.rules, self.directories, changed, self.index)
+        indexer.index_ready.connect(self._on_index_ready)
+        indexer.finished.connect(lambda: self.indexers.remove(indexer))
+        self.indexers.append(indexer)
+        self.indexer = indexer
+        indexer.start()
+
+    def _on_index_ready(self, index, directories):
+        if self.sender() is not self.indexer:
+            return
+        self.indexer = None
+        old = self.directories
+        self.index = index
+        self.directories = directories
+        removed = [self._absolute(path) for path in old if path not in directories]
+        if removed:
+            self._watcher.removePaths(removed)
+        self.unwatched = {path for path in self.unwatched if path in directories}
+        self._to_watch.extend(self._absolute(path) for path in directories if path not in old)
+        self._watch_some()
+        self.updated.emit()
+        if self._changed:
+            self._rescan_timer.start()
+
+    def _watch_some(self):
+        if not self._to_watch:
+            return
+        batch, self._to_watch = self._to_watch[:self.WATCH_BATCH], self._to_watch[self.WATCH_BATCH:]
+        # addPaths returns what it could not watch, e.g. past the inotify limit
+        failed = self._watcher.addPaths(batch)
+        self.unwatched |= {self._relative(path) for path in failed}
+        if self._to_watch:
+            QTimer.singleShot(0, self._watch_some)
+
+    def _on_directory_changed(self, path):
+        self._changed.add(self._relative(path))
+        self._rescan_timer.start()
+
+    def _rescan(self):
+        if self.indexer is not None:
+            # Picked up when the running indexer is done
+            return
+        changed, self._changed = self._changed, set()
+        self._start(changed)
+
+    def _absolute(self, relative):
+        return os.path.join(self.root, *relative.split('/')) if relative else self.root
+
+    def _relative(self, path):
+        relative = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return '' if relative == '.' else relative
+
+
+class QuickOpenModel(QAbstractListModel):
+    def __init__(self, root='', parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.paths = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        path = self.paths[index.row()]
+        if role == Qt.DisplayRole:
+            directory = os.path.relpath(os.path.dirname(path), self.root)
+            return os.path.basename(path) if directory == '.' else f"{os.path.basename(path)}    {directory}"
+        if role in (Qt.ToolTipRole, Qt.UserRole):
+            return path
+        return None
+
+    def set_paths(self, paths):
+        self.beginResetModel()
+        self.paths = paths
+        self.endResetModel()
+
+
+class QuickOpenDialog(QDialog):
+    """Ctrl+P finder: type part of a path, Enter opens the selected file."""
+    RESULT_LIMIT = 100
+
+    def __init__(self, path_index, parent=None):
+        super().__init__(parent)
+        self.path_index = path_index
+        self.setWindowTitle("Go to File")
+        self.resize(600, 400)
+        layout = QVBoxLayout(self)
+
+        self.query = QLineEdit()
+        self.query.setPlaceholderText("Type part of a file name or path")
+        self.query.textChanged.connect(self.update_results)
+        self.query.returnPressed.connect(self.accept)
+        self.query.installEventFilter(self)
+        layout.addWidget(self.query)
+
+        self.model = QuickOpenModel(path_index.root, self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.activated.connect(self.accept)
+        layout.addWidget(self.view)
+
+        self.status = QLabel()
+        self.status.setStyleSheet("color: #666;")
+        layout.addWidget(self.status)
+
+        path_index.updated.connect(self.update_results)
+        self.update_results()
+
+    def update_results(self):
+        self.model.set_paths(self.path_index.search(self.query.text(), self.RESULT_LIMIT))
+        if self.model.paths:
+            self.view.setCurrentIndex(self.model.index(0))
+        if not self.path_index.is_ready():
+            self.status.setText("Indexing folder...")
+        else:
+            self.status.setText(f"{len(self.path_index.index)} files")
+
+    def eventFilter(self, obj, event):
+        # Up/Down/PageUp/PageDown move through the results while typing
+        if obj is self.query and event.type() == QEvent.KeyPress and \
+                event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            QApplication.sendEvent(self.view, event)
+            return True
+        return super().eventFilter(obj, event)
+
+    def selected_path(self):
+        index = self.view.currentIndex()
+        return index.data(Qt.UserRole) if index.isValid() else None
+
+    def done(self, result):
+        self.path_index.updated.disconnect(self.update_results)
+        if self.path_index.index is not None:
+            self.path_index.index.forget_queries()
+        super().done(result)
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+import psutil
+from PyQt5.QtCore import QObject, QTimer
+
+
+class ProcessMonitor(QObject):
+    """Resource usage of one running program.
+
+    The process is sampled with psutil while it runs; peak memory comes from
+    those samples (``peak_wset`` on Windows, VmHWM on Linux). On POSIX a
+    watcher thread also waits for the program to exit without reaping it and
+    reads its final CPU time and context switches from the zombie. QProcess
+    may reap it first, and Windows has no such wait; the figures are then
+    those of the last sample and marked as lower bounds.
+    """
+    SAMPLE_INTERVAL_MS = 20
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.SAMPLE_INTERVAL_MS)
+        self._timer.timeout.connect(self.sample)
+        self._process = None
+        self._start = None
+        self._watcher = None
+
+    def start(self, pid):
+        self._start = time.perf_counter()
+        self.user = self.system = 0.0
+        self.voluntary = self.involuntary = 0
+        self.peak_rss = 0
+        try:
+            self._process = psutil.Process(pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._process = None
+        self._final = {}
+        self._watcher = None
+        if self._process is not None and hasattr(os, 'waitid'):
+            self._watcher = threading.Thread(target=self._read_exited, args=(self._process, self._final),
+                                             daemon=True)
+            self._watcher.start()
+        self.sample()
+        self._timer.start()
+
+    @staticmethod
+    def _read_exited(process, final):
+        try:
+            # WNOWAIT leaves the zombie for QProcess to reap
+            os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+            exited = psutil.Process(process.pid)
+            if exited.create_time() != process.create_time():
+                return  # reaped already and the pid reused
+            with exited.oneshot():
+                final['cpu'] = exited.cpu_times()
+                final['ctx'] = exited.num_ctx_switches()
+        except (OSError, psutil.Error):
+            pass  # QProcess reaped it first
+
+    def sample(self):
+        if self._process is None:
+            return
+        try:
+            with self._process.oneshot():
+                cpu = self._process.cpu_times()
+                ctx = self._process.num_ctx_switches()
+                memory = self._process.memory_info()
+            self.user, self.system = cpu.user, cpu.system
+            self.voluntary, self.involuntary = ctx.voluntary, ctx.involuntary
+            self.peak_rss = max(self.peak_rss, getattr(memory, 'peak_wset', memory.rss), self._high_water_mark())
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            self._process = None
+
+    def _high_water_mark(self):
+        try:
+            with open(f'/proc/{self._process.pid}/status', 'rb') as f:
+                for line in f:
+                    if line.startswith(b'VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return 0
+
+    def stop(self):
+        """Stop sampling and return the stats of the finished run."""
+        self._timer.stop()
+        if self._start is None:
+            return None
+        if self._watcher is not None:
+            self._watcher.join(0.5)
+        final = dict(self._final)
+        if 'ctx' in final:
+            self.user, self.system = final['cpu'].user, final['cpu'].system
+            self.voluntary, self.involuntary = final['ctx'].voluntary, final['ctx'].involuntary
+        stats = {
+            'time': time.time(),
+            'wall': time.perf_counter() - self._start,
+            'user': self.user,
+            'system': self.system,
+            'peak_rss': self.peak_rss,
+            'voluntary': self.voluntary,
+            'involuntary': self.involuntary,
+            'sampled': 'ctx' not in final,
+        }
+        self._process = None
+        self._start = None
+        self._watcher = None
+        return stats
+
+
+def format_stats(stats):
+    # Sampled figures miss whatever ran after the last sample
+    at_least = '>=' if stats.get('sampled') else ''
+    text = (f"wall {stats['wall'] * 1000:.1f} ms | user {at_least}{stats['user'] * 1000:.1f} ms | "
+            f"sys {at_least}{stats['system'] * 1000:.1f} ms | peak RSS {stats['peak_rss'] / (1024 * 1024):.1f} MB | "
+            f"ctx switches {at_least}{stats['voluntary']} vol / {at_least}{stats['involuntary']} invol")
+    if stats.get('sampled'):
+        text += f" (CPU sampled every {ProcessMonitor.SAMPLE_INTERVAL_MS} ms)"
+    return text
+
+
+def format_history(name, history):
+    lines = [f"--- Run history of {name} ({len(history)} runs) ---"]
+    for stats in history:
+        lines.append(f"{time.strftime('%H:%M:%S', time.localtime(stats['time']))}  "
+                     f"exit {stats.get('exit_code', '?')}  {format_stats(stats)}")
+    return '\n'.join(lines) + '\n'
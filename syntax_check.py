@@ -0,0 +1,120 @@
+import hashlib
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from command_stream import stream_command
+from diagnostics import DiagnosticParser
+from precompiled_header import PrecompiledHeader, leading_includes
+
+
+UNSAVED_NAME = '<stdin>'
+SYNTAX_CHECK_TIMEOUT = 20
+
+
+class SyntaxChecker(QThread):
+    """Runs ``-fsyntax-only`` on editor buffers, one at a time, in the background.
+
+    Only the newest request is kept: a request that arrives while gcc is
+    still checking an older buffer kills that run, and every request bumps a
+    generation so a result for anything older is never delivered. Results are
+    cached by a hash of the buffer and its command line, so undoing back to a
+    checked state answers at once.
+    """
+    results_ready = pyqtSignal(object, object)  # token, [Diagnostic]
+    _checked = pyqtSignal(int, object, object)  # generation, token, [Diagnostic]
+    CACHE_SIZE = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = None
+        self._generation = 0
+        self._running = 0
+        self._cache = OrderedDict()
+        self.checks = 0
+        self.cache_hits = 0
+        self.superseded = 0
+        # Emitted from the worker, delivered in the GUI thread where check() runs
+        self._checked.connect(self._deliver)
+
+    def check(self, token, text, file_path, compiler, flags=(), use_pch=True):
+        """Queue a check of ``text``; ``token`` comes back with the diagnostics."""
+        source_name = file_path or UNSAVED_NAME
+        key = hashlib.sha256('\0'.join([compiler, source_name, text] + list(flags)).encode('utf-8')).hexdigest()
+        with self._lock:
+            self._generation += 1
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                self._pending = None  # whatever was waiting is older than this
+            else:
+                self._pending = (self._generation, token, key, text, file_path, compiler, list(flags), use_pch)
+                self._wake.set()
+        if cached is not None:
+            self.results_ready.emit(token, cached)
+
+    def stop(self):
+        self.requestInterruption()
+        self._wake.set()
+        self.wait()
+
+    def _superseded(self):
+        return self._running != self._generation or self.isInterruptionRequested()
+
+    def _deliver(self, generation, token, diagnostics):
+        if generation != self._generation:
+            self.superseded += 1
+            return
+        self.results_ready.emit(token, diagnostics)
+
+    def run(self):
+        while not self.isInterruptionRequested():
+            self._wake.wait()
+            with self._lock:
+                request, self._pending = self._pending, None
+                self._wake.clear()
+            if request is None:
+                continue
+            generation, token, key, text, file_path, compiler, flags, use_pch = request
+            self._running = generation
+            diagnostics = self._run_check(text, file_path, compiler, flags, use_pch)
+            if diagnostics is None:
+                self.superseded += self._running != self._generation
+                continue
+            with self._lock:
+                self._cache[key] = diagnostics
+                while len(self._cache) > self.CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            self.checks += 1
+            self._checked.emit(generation, token, diagnostics)
+
+    def _run_check(self, text, file_path, compiler, flags, use_pch):
+        language = 'c' if compiler == 'gcc' else 'c++'
+        command = [compiler] + flags
+        if use_pch:
+            includes = leading_includes(text)
+            pch = PrecompiledHeader(includes, compiler, flags) if includes else None
+            # Only reuse a header a build already made; building one here would stall the check
+            if pch is not None and pch.is_built():
+                command += pch.include_args
+        command += ['-fsyntax-only', '-x', language, '-']
+
+        directory = os.path.dirname(file_path) if file_path else None
+        parser = DiagnosticParser(directory, file_path or UNSAVED_NAME)
+        diagnostics = []
+        try:
+            returncode = stream_command(command, lambda output: diagnostics.extend(parser.feed(output)),
+                                        SYNTAX_CHECK_TIMEOUT, self._superseded, cwd=directory,
+                                        input=text.encode('utf-8'))
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Syntax check failed: {e}")
+            return None
+        if returncode is None:
+            return None
+        return diagnostics + parser.finish()
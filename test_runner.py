@@ -0,0 +1,137 @@
+import os
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from workspace_index import SKIPPED_DIRS
+
+
+EXPECTED_EXTENSIONS = ('.out', '.ans')
+DEFAULT_TIME_LIMIT = 2.0
+DEFAULT_MEMORY_LIMIT_MB = 256
+
+
+def discover_cases(folder):
+    """Return ``[(name, input_path, expected_path)]`` for every ``.in`` with a matching ``.out``/``.ans``."""
+    cases = []
+    for dirpath, dirnames, filenames in os.walk(folder):
+        dirnames[:] = [d for d in dirnames if d not in SKIPPED_DIRS and not d.startswith('.')]
+        names = set(filenames)
+        for name in filenames:
+            stem, ext = os.path.splitext(name)
+            if ext != '.in':
+                continue
+            for expected_ext in EXPECTED_EXTENSIONS:
+                if stem + expected_ext in names:
+                    cases.append((os.path.relpath(os.path.join(dirpath, stem), folder),
+                                  os.path.join(dirpath, name),
+                                  os.path.join(dirpath, stem + expected_ext)))
+                    break
+    return sorted(cases)
+
+
+def _normalized_lines(text):
+    lines = [line.rstrip() for line in text.replace('\r\n', '\n').split('\n')]
+    while lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def first_difference(expected, actual):
+    """Describe the first differing line, ignoring trailing whitespace; None if equal."""
+    expected_lines = _normalized_lines(expected)
+    actual_lines = _normalized_lines(actual)
+    for number, (want, got) in enumerate(zip(expected_lines, actual_lines), 1):
+        if want != got:
+            return f"line {number}: expected {want[:80]!r}, got {got[:80]!r}"
+    if len(expected_lines) != len(actual_lines):
+        return f"expected {len(expected_lines)} lines, got {len(actual_lines)}"
+    return None
+
+
+def run_case(exe_path, input_path, expected_path, time_limit, memory_limit):
+    """Run one case and judge it; returns ``(verdict, seconds, peak_rss, detail)``."""
+    with open(input_path, 'rb') as stdin, tempfile.TemporaryFile() as stdout:
+        start = time.perf_counter()
+        proc = subprocess.Popen([exe_path], stdin=stdin, stdout=stdout, stderr=subprocess.DEVNULL,
+                                cwd=os.path.dirname(input_path))
+        verdict = None
+        peak = 0
+        while proc.poll() is None:
+            try:
+                memory = psutil.Process(proc.pid).memory_info()
+                peak = max(peak, getattr(memory, 'peak_wset', memory.rss))
+            except psutil.Error:
+                pass
+            if peak > memory_limit:
+                verdict = 'MLE'
+            elif time.perf_counter() - start > time_limit:
+                verdict = 'TLE'
+            if verdict:
+                proc.kill()
+                proc.wait()
+                break
+            time.sleep(0.002)
+        elapsed = time.perf_counter() - start
+
+        if verdict:
+            return verdict, elapsed, peak, ''
+        if proc.returncode != 0:
+            return 'RE', elapsed, peak, f"exit code {proc.returncode}"
+        stdout.seek(0)
+        actual = stdout.read().decode('utf-8', errors='replace')
+
+    with open(expected_path, 'r', encoding='utf-8', errors='replace') as f:
+        difference = first_difference(f.read(), actual)
+    return ('FAIL', elapsed, peak, difference) if difference else ('PASS', elapsed, peak, '')
+
+
+class TestRunner(QThread):
+    """Run an executable against ``.in``/``.out`` pairs, one process per core.
+
+    Each pool thread only starts a case's process and watches it, so the
+    cases themselves run in parallel as separate processes.
+    """
+    output_signal = pyqtSignal(str)
+
+    def __init__(self, exe_path, cases, time_limit=DEFAULT_TIME_LIMIT,
+                 memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, workers=None):
+        super().__init__()
+        self.exe_path = exe_path
+        self.cases = cases
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 1024 * 1024
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self):
+        self.output_signal.emit(
+            f"--- Running {len(self.cases)} tests (time limit {self.time_limit:g}s, "
+            f"memory limit {self.memory_limit // (1024 * 1024)} MB, {self.workers} workers) ---\n")
+        start = time.perf_counter()
+        counts = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(run_case, self.exe_path, input_path, expected_path,
+                                   self.time_limit, self.memory_limit)
+                       for _, input_path, expected_path in self.cases]
+            for (name, _, _), future in zip(self.cases, futures):
+                if self.isInterruptionRequested():
+                    for pending in futures:
+                        pending.cancel()
+                    self.output_signal.emit("--- Tests cancelled ---\n")
+                    return
+                try:
+                    verdict, seconds, peak, detail = future.result()
+                except Exception as e:
+                    verdict, seconds, peak, detail = 'ERROR', 0.0, 0, str(e)
+                counts[verdict] = counts.get(verdict, 0) + 1
+                line = f"{verdict:<5} {name:<30} {seconds * 1000:8.1f} ms {peak / (1024 * 1024):7.1f} MB"
+                self.output_signal.emit(line + (f"  {detail}" if detail else "") + "\n")
+
+        summary = ", ".join(f"{counts[v]} {v}" for v in ('PASS', 'FAIL', 'TLE', 'MLE', 'RE', 'ERROR') if v in counts)
+        self.output_signal.emit(
+            f"--- {counts.get('PASS', 0)}/{len(self.cases)} passed ({summary}) "
+            f"in {time.perf_counter() - start:.2f}s ---\n\n")
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+SOURCE_EXTENSIONS = ('.c', '.cpp', '.cc', '.cxx', '.h', '.hpp')
+SKIPPED_DIRS = {'.git', '.svn', '.hg', '__pycache__', 'node_modules', 'build'}
+INDEX_FORMAT = 1
+
+
+def cache_dir(*parts):
+    """Return (and create) a directory under the editor's per-user cache."""
+    path = os.path.join(os.path.expanduser('~'), '.cpp_editor', *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+_COMMENT_RE = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+_MACRO_RE = re.compile(r'^[ \t]*#[ \t]*define[ \t]+([A-Za-z_]\w*)', re.M)
+_TYPE_RE = re.compile(r'\b(?:class|struct|union|enum(?:[ \t]+(?:class|struct))?)[ \t]+([A-Za-z_]\w*)')
+_TYPEDEF_RE = re.compile(r'\btypedef\b[^;{]*?([A-Za-z_]\w*)[ \t]*(?:\[[^\]]*\])?[ \t]*;')
+_USING_RE = re.compile(r'\busing[ \t]+([A-Za-z_]\w*)[ \t]*=')
+_FUNCTION_RE = re.compile(
+    r'^[ \t]*(?:[A-Za-z_][\w:<>,]*[ \t\*&]+)+\**&?([A-Za-z_]\w*)[ \t]*\(', re.M)
+_ENUM_BODY_RE = re.compile(r'\benum\b[^{;]*\{([^}]*)\}')
+_ENUMERATOR_RE = re.compile(r'(?:^|,)\s*([A-Za-z_]\w*)')
+_NOT_FUNCTIONS = {
+    'if', 'for', 'while', 'switch', 'return', 'sizeof', 'catch', 'else',
+    'new', 'delete', 'throw', 'case', 'do', 'operator', 'decltype',
+}
+
+
+def extract_file_symbols(text):
+    """Functions, types, macros and enum values declared in a C/C++ source file."""
+    text = _COMMENT_RE.sub(' ', text)
+    symbols = set(_MACRO_RE.findall(text))
+    symbols.update(_TYPE_RE.findall(text))
+    symbols.update(_TYPEDEF_RE.findall(text))
+    symbols.update(_USING_RE.findall(text))
+    symbols.update(name for name in _FUNCTION_RE.findall(text) if name not in _NOT_FUNCTIONS)
+    for body in _ENUM_BODY_RE.findall(text):
+        symbols.update(_ENUMERATOR_RE.findall(body))
+    return sorted(s for s in symbols if len(s) > 1)
+
+
+def iter_source_files(root, extensions=SOURCE_EXTENSIONS):
+    """Yield ``(path, mtime_ns, size)`` for every source file under ``root``."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIPPED_DIRS and not d.startswith('.')]
+        for name in filenames:
+            if not name.endswith(extensions):
+                continue
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield path, st.st_mtime_ns, st.st_size
+
+
+def _parse_file(path):
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return extract_file_symbols(f.read())
+    except OSError:
+        return []
+
+
+class WorkspaceIndexer(QThread):
+    """Index the symbols of every C/C++ file under a folder.
+
+    Results are stored in an on-disk index keyed by path, mtime and size, so
+    re-opening a folder only parses the files that changed since last time.
+    """
+    symbols_ready = pyqtSignal(str, object)
+    output_signal = pyqtSignal(str)
+
+    def __init__(self, root, max_workers=None):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        digest = hashlib.sha1(os.path.normcase(self.root).encode('utf-8')).hexdigest()[:16]
+        self.index_path = os.path.join(cache_dir('index'), digest + '.json')
+
+    def run(self):
+        previous = self.load_index()
+        files = {}
+        stale = []
+        for path, mtime, size in iter_source_files(self.root):
+            if self.isInterruptionRequested():
+                return
+            entry = previous.get(path)
+            if entry and entry[0] == mtime and entry[1] == size:
+                files[path] = entry
+            else:
+                files[path] = [mtime, size, []]
+                stale.append(path)
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(_parse_file, path) for path in stale]
+                for path, future in zip(stale, futures):
+                    if self.isInterruptionRequested():
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                    files[path][2] = future.result()
+            self.save_index(files)
+        elif len(files) != len(previous):
+            self.save_index(files)
+
+        symbols = set()
+        for _, _, file_symbols in files.values():
+            symbols.update(file_symbols)
+        self.symbols_ready.emit(self.root, tuple(sorted(symbols)))
+        self.output_signal.emit(
+            f"Indexed {len(files)} files ({len(stale)} parsed, "
+            f"{len(files) - len(stale)} from cache), {len(symbols)} symbols\n")
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get('format') != INDEX_FORMAT or data.get('root') != self.root:
+            return {}
+        return data.get('files', {})
+
+    def save_index(self, files):
+        temp_path = self.index_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'format': INDEX_FORMAT, 'root': self.root, 'files': files}, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save workspace index: {e}")